@@ -8,9 +8,9 @@ discovery and database connection management.
 
 import asyncio
 from logging.config import fileConfig
-from sqlalchemy import pool
+from sqlalchemy import create_engine
 from sqlalchemy.engine import Connection
-from sqlalchemy.ext.asyncio import async_engine_from_config
+from sqlalchemy.ext.asyncio import create_async_engine
 from alembic import context
 import os
 import sys
@@ -32,6 +32,14 @@ if config.config_file_name is not None:
 # Target metadata for autogenerate support
 target_metadata = Base.metadata
 
+# URL schemes whose drivers require an async engine
+_ASYNC_SCHEMES = frozenset({
+    "postgresql+asyncpg",
+    "postgresql+psycopg_async",
+    "mysql+aiomysql",
+    "sqlite+aiosqlite",
+})
+
 def get_database_url():
     """Get database URL from application settings."""
     try:
@@ -41,6 +49,26 @@ def get_database_url():
         # Fallback to environment variable
         return os.getenv("DATABASE_URL", "sqlite:///ai_codereview.db")
 
+def _is_async_url(database_url: str) -> bool:
+    """Check whether the URL names an async DBAPI driver."""
+    return database_url.split("://", 1)[0] in _ASYNC_SCHEMES
+
+def _make_engine(database_url: str):
+    """
+    Create a migration engine for the URL.
+    
+    Server databases get a small pool so consecutive migration steps reuse
+    one authenticated connection instead of reconnecting; SQLite keeps the
+    dialect's default pool.
+    """
+    engine_kwargs = {}
+    if not database_url.startswith("sqlite"):
+        engine_kwargs = {"pool_size": 2, "max_overflow": 0}
+    
+    if _is_async_url(database_url):
+        return create_async_engine(database_url, **engine_kwargs)
+    return create_engine(database_url, **engine_kwargs)
+
 def run_migrations_offline() -> None:
     """
     Run migrations in 'offline' mode.
@@ -73,18 +101,9 @@ def do_run_migrations(connection: Connection) -> None:
     with context.begin_transaction():
         context.run_migrations()
 
-async def run_async_migrations() -> None:
+async def run_async_migrations(database_url: str) -> None:
     """Run migrations in async mode for async database engines."""
-    configuration = config.get_section(config.config_ini_section)
-    
-    # Override database URL with application settings
-    configuration["sqlalchemy.url"] = get_database_url()
-    
-    connectable = async_engine_from_config(
-        configuration,
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    connectable = _make_engine(database_url)
 
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
@@ -95,30 +114,35 @@ def run_migrations_online() -> None:
     """
     Run migrations in 'online' mode.
     
-    Creates an Engine and associates a connection with the context.
-    Supports both sync and async database engines.
+    A caller that already holds a connection passes a synchronous
+    Connection through config.attributes["connection"], obtained from an
+    AsyncConnection via run_sync() so it runs on the caller's event loop.
+    Otherwise an engine is created for the configured URL, with async
+    drivers driven by a fresh event loop.
     """
-    database_url = get_database_url()
+    connection = context.config.attributes.get("connection", None)
     
-    # Check if we're using an async database URL
-    if database_url.startswith(("postgresql+asyncpg://", "mysql+aiomysql://")):
-        asyncio.run(run_async_migrations())
+    if connection is not None:
+        if not isinstance(connection, Connection):
+            raise TypeError(
+                "config.attributes['connection'] must be a synchronous "
+                "Connection; pass it from AsyncConnection.run_sync()"
+            )
+        # The caller owns the connection's lifecycle
+        do_run_migrations(connection)
+        return
+    
+    database_url = get_database_url()
+    if _is_async_url(database_url):
+        asyncio.run(run_async_migrations(database_url))
     else:
         # Synchronous migration for SQLite and other sync drivers
-        configuration = config.get_section(config.config_ini_section)
-        configuration["sqlalchemy.url"] = database_url
-        
-        connectable = context.config.attributes.get("connection", None)
-        
-        if connectable is None:
-            from sqlalchemy import create_engine
-            connectable = create_engine(
-                database_url,
-                poolclass=pool.NullPool,
-            )
+        connectable = _make_engine(database_url)
 
         with connectable.connect() as connection:
             do_run_migrations(connection)
+        
+        connectable.dispose()
 
 # Determine which migration mode to run
 if context.is_offline_mode():
@@ -0,0 +1,144 @@
+"""Create the initial schema
+
+Creates the repositories, users, analysis_records, webhook_events and
+system_metrics tables as they existed before the first migration, so
+that `alembic upgrade head` can build a database from scratch.
+
+Revision ID: 0a1c5e7f9b24
+Revises:
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "0a1c5e7f9b24"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def _timestamps() -> list:
+    """Columns provided by TimestampMixin."""
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+def upgrade() -> None:
+    """Create the baseline tables and their indexes."""
+    op.create_table(
+        "repositories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("github_id", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("owner", sa.String(100), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("html_url", sa.String(500), nullable=True),
+        sa.Column("clone_url", sa.String(500), nullable=True),
+        sa.Column("default_branch", sa.String(100), nullable=True),
+        sa.Column("primary_language", sa.String(50), nullable=True),
+        sa.Column("is_private", sa.Boolean(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=True),
+        sa.Column("auto_analysis", sa.Boolean(), nullable=True),
+        sa.Column("webhook_url", sa.String(500), nullable=True),
+        sa.Column("webhook_secret", sa.String(255), nullable=True),
+        sa.Column("analysis_config", sa.JSON(), nullable=True),
+        sa.Column("total_analyses", sa.Integer(), nullable=True),
+        sa.Column("last_analysis_at", sa.DateTime(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_repositories_id", "repositories", ["id"])
+    op.create_index("ix_repositories_github_id", "repositories", ["github_id"], unique=True)
+    op.create_index("ix_repositories_full_name", "repositories", ["full_name"], unique=True)
+    op.create_index("ix_repositories_status", "repositories", ["status"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("preferences", sa.JSON(), nullable=True),
+        sa.Column("github_username", sa.String(100), nullable=True),
+        sa.Column("github_token", sa.String(255), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_github_username", "users", ["github_username"])
+
+    op.create_table(
+        "analysis_records",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("analysis_id", sa.String(50), nullable=False),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("repository_id", sa.Integer(), sa.ForeignKey("repositories.id"), nullable=True),
+        sa.Column("branch", sa.String(100), nullable=True),
+        sa.Column("commit_sha", sa.String(40), nullable=True),
+        sa.Column("analysis_result", sa.JSON(), nullable=False),
+        sa.Column("quality_score", sa.Float(), nullable=True),
+        sa.Column("security_issues_count", sa.Integer(), nullable=True),
+        sa.Column("overall_rating", sa.String(20), nullable=True),
+        sa.Column("language", sa.String(50), nullable=True),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("analysis_duration", sa.Float(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_analysis_records_id", "analysis_records", ["id"])
+    op.create_index("ix_analysis_records_analysis_id", "analysis_records", ["analysis_id"], unique=True)
+    op.create_index("ix_analysis_records_commit_sha", "analysis_records", ["commit_sha"])
+    op.create_index("ix_analysis_records_quality_score", "analysis_records", ["quality_score"])
+    op.create_index("idx_analysis_repo_created", "analysis_records", ["repository_id", "created_at"])
+    op.create_index("idx_analysis_quality_created", "analysis_records", ["quality_score", "created_at"])
+
+    op.create_table(
+        "webhook_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.String(50), nullable=False),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("repository_id", sa.Integer(), sa.ForeignKey("repositories.id"), nullable=True),
+        sa.Column("sender", sa.String(100), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("headers", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=True),
+        sa.Column("processing_started_at", sa.DateTime(), nullable=True),
+        sa.Column("processing_completed_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("analysis_triggered", sa.Boolean(), nullable=True),
+        sa.Column("analysis_id", sa.String(50), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_webhook_events_id", "webhook_events", ["id"])
+    op.create_index("ix_webhook_events_event_id", "webhook_events", ["event_id"], unique=True)
+    op.create_index("ix_webhook_events_event_type", "webhook_events", ["event_type"])
+    op.create_index("ix_webhook_events_status", "webhook_events", ["status"])
+    op.create_index("idx_webhook_type_created", "webhook_events", ["event_type", "created_at"])
+    op.create_index("idx_webhook_status_created", "webhook_events", ["status", "created_at"])
+    op.create_index("idx_webhook_repo_created", "webhook_events", ["repository_id", "created_at"])
+
+    op.create_table(
+        "system_metrics",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("metric_name", sa.String(100), nullable=False),
+        sa.Column("metric_value", sa.Float(), nullable=False),
+        sa.Column("metric_unit", sa.String(20), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_system_metrics_id", "system_metrics", ["id"])
+    op.create_index("ix_system_metrics_metric_name", "system_metrics", ["metric_name"])
+    op.create_index("idx_metrics_name_created", "system_metrics", ["metric_name", "created_at"])
+
+def downgrade() -> None:
+    """Drop the baseline tables, dependents first."""
+    op.drop_table("system_metrics")
+    op.drop_table("webhook_events")
+    op.drop_table("analysis_records")
+    op.drop_table("users")
+    op.drop_table("repositories")
@@ -0,0 +1,68 @@
+"""Store JSON payload columns as JSONB on PostgreSQL
+
+Converts the generic json columns to jsonb and adds a jsonb_path_ops GIN
+index for containment queries on webhook payloads. Other databases keep
+their generic JSON storage, so this revision is a no-op there.
+
+Revision ID: 3f1a9c2d7e4b
+Revises: 0a1c5e7f9b24
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic
+revision = "3f1a9c2d7e4b"
+down_revision = "0a1c5e7f9b24"
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs stored as JSON documents
+JSON_COLUMNS = (
+    ("analysis_records", "analysis_result"),
+    ("repositories", "analysis_config"),
+    ("users", "preferences"),
+    ("webhook_events", "payload"),
+    ("webhook_events", "headers"),
+    ("system_metrics", "tags"),
+)
+
+def upgrade() -> None:
+    """Convert JSON columns to JSONB and index webhook payloads."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f"{column}::jsonb",
+        )
+
+    op.create_index(
+        "idx_webhook_payload_gin",
+        "webhook_events",
+        ["payload"],
+        postgresql_using="gin",
+        postgresql_ops={"payload": "jsonb_path_ops"},
+    )
+
+def downgrade() -> None:
+    """Revert JSONB columns to JSON and drop the payload index."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("idx_webhook_payload_gin", table_name="webhook_events")
+
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using=f"{column}::json",
+        )
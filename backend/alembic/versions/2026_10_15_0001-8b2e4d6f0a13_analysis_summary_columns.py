@@ -0,0 +1,40 @@
+"""Add denormalized security summary columns to analysis records
+
+Adds has_high_severity and the indexed security_risk_level column so
+list and summary queries can read them without parsing analysis_result.
+
+Revision ID: 8b2e4d6f0a13
+Revises: 3f1a9c2d7e4b
+Create Date: 2026-10-15 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "8b2e4d6f0a13"
+down_revision = "3f1a9c2d7e4b"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    """Add the summary columns and risk level index."""
+    op.add_column(
+        "analysis_records",
+        sa.Column("has_high_severity", sa.Boolean(), nullable=True, server_default=sa.false()),
+    )
+    op.add_column(
+        "analysis_records",
+        sa.Column("security_risk_level", sa.String(length=10), nullable=True),
+    )
+    op.create_index(
+        "ix_analysis_records_security_risk_level",
+        "analysis_records",
+        ["security_risk_level"],
+    )
+
+def downgrade() -> None:
+    """Drop the summary columns and risk level index."""
+    op.drop_index("ix_analysis_records_security_risk_level", table_name="analysis_records")
+    op.drop_column("analysis_records", "security_risk_level")
+    op.drop_column("analysis_records", "has_high_severity")
@@ -0,0 +1,46 @@
+"""Drop indexes made redundant by composites and primary keys
+
+Single-column indexes on webhook_events.status/event_type and
+analysis_records.quality_score duplicate the leading column of existing
+composite indexes, and the id indexes duplicate the primary keys. Adds a
+(status, event_type, created_at) composite for status-by-type queries.
+
+Revision ID: c47d19e25b86
+Revises: 8b2e4d6f0a13
+Create Date: 2026-10-15 00:02:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "c47d19e25b86"
+down_revision = "8b2e4d6f0a13"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) no longer declared by the models
+REDUNDANT_INDEXES = (
+    ("ix_webhook_events_id", "webhook_events", ["id"]),
+    ("ix_webhook_events_status", "webhook_events", ["status"]),
+    ("ix_webhook_events_event_type", "webhook_events", ["event_type"]),
+    ("ix_analysis_records_id", "analysis_records", ["id"]),
+    ("ix_analysis_records_quality_score", "analysis_records", ["quality_score"]),
+)
+
+def upgrade() -> None:
+    """Replace redundant indexes with the status/type composite."""
+    op.create_index(
+        "idx_webhook_status_type_created",
+        "webhook_events",
+        ["status", "event_type", "created_at"],
+    )
+
+    for name, table, _ in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table)
+
+def downgrade() -> None:
+    """Restore the single-column indexes."""
+    for name, table, columns in REDUNDANT_INDEXES:
+        op.create_index(name, table, columns)
+
+    op.drop_index("idx_webhook_status_type_created", table_name="webhook_events")
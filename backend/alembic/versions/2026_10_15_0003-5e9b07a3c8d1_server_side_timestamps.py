@@ -0,0 +1,48 @@
+"""Generate created_at/updated_at defaults on the database server
+
+Revision ID: 5e9b07a3c8d1
+Revises: c47d19e25b86
+Create Date: 2026-10-15 00:03:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "5e9b07a3c8d1"
+down_revision = "c47d19e25b86"
+branch_labels = None
+depends_on = None
+
+# Tables using TimestampMixin
+TIMESTAMPED_TABLES = (
+    "analysis_records",
+    "repositories",
+    "users",
+    "webhook_events",
+    "system_metrics",
+)
+
+def upgrade() -> None:
+    """Add server-side defaults to the timestamp columns."""
+    for table in TIMESTAMPED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            for column in ("created_at", "updated_at"):
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    existing_nullable=False,
+                    server_default=sa.func.now(),
+                )
+
+def downgrade() -> None:
+    """Remove the server-side timestamp defaults."""
+    for table in TIMESTAMPED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            for column in ("created_at", "updated_at"):
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    existing_nullable=False,
+                    server_default=None,
+                )
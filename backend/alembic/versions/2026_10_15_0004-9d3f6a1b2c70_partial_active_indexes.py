@@ -0,0 +1,56 @@
+"""Replace hot-path composites with partial indexes
+
+The (status, created_at) index on webhook_events now skips completed
+events, and the (repository_id, created_at) index on analysis_records
+skips rows without a repository. Both predicates are supported by
+PostgreSQL and SQLite.
+
+Revision ID: 9d3f6a1b2c70
+Revises: 5e9b07a3c8d1
+Create Date: 2026-10-15 00:04:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "9d3f6a1b2c70"
+down_revision = "5e9b07a3c8d1"
+branch_labels = None
+depends_on = None
+
+# (partial index, full index it replaces, table, columns, predicate)
+PARTIAL_INDEXES = (
+    (
+        "idx_webhook_active",
+        "idx_webhook_status_created",
+        "webhook_events",
+        ["status", "created_at"],
+        "status != 'completed'",
+    ),
+    (
+        "idx_analysis_repo_active",
+        "idx_analysis_repo_created",
+        "analysis_records",
+        ["repository_id", "created_at"],
+        "repository_id IS NOT NULL",
+    ),
+)
+
+def upgrade() -> None:
+    """Create the partial indexes and drop the full ones."""
+    for name, replaced, table, columns, predicate in PARTIAL_INDEXES:
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_where=sa.text(predicate),
+            sqlite_where=sa.text(predicate),
+        )
+        op.drop_index(replaced, table_name=table)
+
+def downgrade() -> None:
+    """Restore the full indexes."""
+    for name, replaced, table, columns, _ in PARTIAL_INDEXES:
+        op.create_index(replaced, table, columns)
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,48 @@
+"""Cascade repository deletes to analyses and webhook events
+
+Recreates the repository_id foreign keys on analysis_records and
+webhook_events with ON DELETE CASCADE. The ORM relationships use
+passive_deletes and leave removing child rows to the database.
+
+Revision ID: e2a7c9f4b816
+Revises: 9d3f6a1b2c70
+Create Date: 2026-10-15 00:05:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "e2a7c9f4b816"
+down_revision = "9d3f6a1b2c70"
+branch_labels = None
+depends_on = None
+
+# Tables whose repository_id references repositories.id
+CHILD_TABLES = ("analysis_records", "webhook_events")
+
+# The initial schema left these foreign keys unnamed. This matches the
+# name PostgreSQL generated for them, and gives SQLite's reflected
+# (nameless) constraints the same name in batch mode.
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+def _recreate_foreign_keys(ondelete) -> None:
+    """Replace each child table's repository_id foreign key."""
+    for table in CHILD_TABLES:
+        name = f"{table}_repository_id_fkey"
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(name, type_="foreignkey")
+            batch_op.create_foreign_key(
+                name,
+                "repositories",
+                ["repository_id"],
+                ["id"],
+                ondelete=ondelete,
+            )
+
+def upgrade() -> None:
+    """Add ON DELETE CASCADE to the repository foreign keys."""
+    _recreate_foreign_keys("CASCADE")
+
+def downgrade() -> None:
+    """Restore the plain repository foreign keys."""
+    _recreate_foreign_keys(None)
@@ -61,7 +61,7 @@ SUPPORTED_LANGUAGES = [
 # AI model configuration
 AI_MODELS_CONFIG = {
     "text_classification": "microsoft/codebert-base",
-    "text_generation": "microsoft/DialoGPT-medium", 
+    "text_generation": "distilgpt2", 
     "question_answering": "deepset/roberta-base-squad2",
     "security_analysis": "huggingface/CodeBERTa-small-v1",
     "code_completion": "microsoft/codebert-base-mlm",
@@ -8,55 +8,112 @@ rate limiting, and request validation.
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, AsyncGenerator, Callable, TYPE_CHECKING
+import os
+import asyncio
 import time
+import hmac
+import hashlib
 import logging
-from functools import wraps
+from functools import wraps, lru_cache
+from uuid import uuid4
+import orjson
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 
-from ..database.connection import get_db_session
-from ..utils.config import Settings
-from ..services.github_integration import GitHubIntegration
+from ..database.connection import get_db_session, get_readonly_db_session
+from ..utils.config import Settings, get_settings
+from ..services.github_integration import GitHubIntegration, get_shared_github_client
+
+if TYPE_CHECKING:
+    from ..services.code_analyzer import CodeAnalyzer
 
 logger = logging.getLogger(__name__)
 
 # Security scheme for API authentication (when I add it later)
 security = HTTPBearer(auto_error=False)
 
-# Global settings instance
-settings = Settings()
+# File extensions accepted for analysis (python, javascript, typescript,
+# java, c/c++, go, rust, php, ruby)
+SUPPORTED_FILE_EXTENSIONS = frozenset({
+    'py', 'js', 'ts', 'java', 'cpp', 'cc', 'cxx', 'c', 'h',
+    'go', 'rs', 'php', 'rb',
+})
 
-def get_settings() -> Settings:
-    """
-    Get application settings.
+# Shared Redis client (created on first use)
+_redis_client: Optional[aioredis.Redis] = None
+
+# Atomic fixed-window counter: increment the key and start its expiry on the first hit
+RATE_LIMIT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+# Cached query results are namespaced by version so a bump invalidates them all
+CACHE_KEY_PREFIX = "v1"
+CACHE_LOCK_SECONDS = 10
+CACHE_LOCK_POLL_INTERVAL = 0.05
+CACHE_LOCK_POLL_ATTEMPTS = 20
+
+def get_redis_client() -> aioredis.Redis:
+    """Get or create the shared async Redis client."""
+    global _redis_client
     
-    This is a dependency that provides access to configuration settings
-    throughout the application. FastAPI will cache this automatically.
-    """
-    return settings
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(get_settings().redis_url)
+    
+    return _redis_client
 
-def get_database() -> Generator[Session, None, None]:
+async def get_database() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency.
     
-    Provides a database session to API endpoints. The session gets
+    Provides an async database session to API endpoints. The session gets
     automatically closed after the request completes, even if an
     exception occurs. 
     """
-    db = get_db_session()
-    try:
+    async for db in get_db_session():
+        yield db
+
+async def get_readonly_database() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency.
+    
+    For endpoints that only query. Any attempt to flush changes through
+    the session raises instead of being written.
+    """
+    async for db in get_readonly_db_session():
         yield db
-    finally:
-        db.close()
 
 def get_github_client(settings: Settings = Depends(get_settings)) -> GitHubIntegration:
     """
     GitHub API client dependency.
     
-    Creates a GitHub integration client with the configured token.
-    This gets reused across endpoints that need to interact with GitHub.
+    Returns the shared GitHub integration client for the configured token,
+    so requests don't pay for building a new client each time.
+    """
+    return get_shared_github_client(settings.github_token, settings.github_max_retries)
+
+def get_code_analyzer() -> "CodeAnalyzer":
+    """
+    Code analyzer dependency.
+    
+    The analyzer pulls in transformers/torch and loads its models, so the
+    module is imported and the instance built on first use rather than at
+    import time. It is the process-wide instance the webhook processor
+    also uses, so both share one result cache.
     """
-    return GitHubIntegration(settings.github_token)
+    from ..services.code_analyzer import get_shared_code_analyzer
+    return get_shared_code_analyzer()
+
+@lru_cache(maxsize=4)
+def _webhook_secret_bytes(secret: str) -> bytes:
+    """Encode the webhook secret once instead of on every delivery."""
+    return secret.encode("utf-8")
 
 async def verify_github_webhook(
     request: Request,
@@ -81,14 +138,13 @@ async def verify_github_webhook(
             detail="Missing webhook signature"
         )
     
-    # Get the raw request body for signature verification
+    # Get the raw request body for signature verification (Starlette caches
+    # it, so the endpoint's own body/JSON read doesn't hit the stream again)
     body = await request.body()
     
-    # Use the GitHub integration to verify the signature
-    github_client = GitHubIntegration("")  # Empty token for signature verification
-    is_valid = github_client.validate_webhook_signature(
-        body, signature, settings.github_webhook_secret
-    )
+    secret = _webhook_secret_bytes(settings.github_webhook_secret.get_secret_value())
+    expected = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    is_valid = hmac.compare_digest(f"sha256={expected}", signature)
     
     if not is_valid:
         logger.error("Invalid GitHub webhook signature")
@@ -103,46 +159,113 @@ def rate_limit(max_requests: int = 60, window_seconds: int = 60):
     """
     Rate limiting decorator for API endpoints.
     
-    This is a simple in-memory rate limiter. 
+    Counts requests per client IP and endpoint in Redis, so the limit
+    holds across all workers. Each request costs one round-trip running
+    an atomic INCR+EXPIRE script.
     
     Args:
         max_requests: Maximum requests allowed in the time window
         window_seconds: Time window in seconds
     """
-    # Simple in-memory storage for request counts
-    # In production, this should use Redis or similar
-    request_counts = {}
-    
     def decorator(func):
         @wraps(func)
         async def wrapper(request: Request, *args, **kwargs):
             client_ip = request.client.host
-            current_time = time.time()
+            key = f"rl:{func.__name__}:{client_ip}"
             
-            # Clean up old entries (simple cleanup)
-            cutoff_time = current_time - window_seconds
-            request_counts[client_ip] = [
-                timestamp for timestamp in request_counts.get(client_ip, [])
-                if timestamp > cutoff_time
-            ]
+            try:
+                count = await get_redis_client().eval(RATE_LIMIT_SCRIPT, 1, key, window_seconds)
+            except RedisError as e:
+                # Fail open - an unavailable cache shouldn't take the API down
+                logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+                count = 0
             
             # Check if rate limit exceeded
-            if len(request_counts.get(client_ip, [])) >= max_requests:
+            if count > max_requests:
                 logger.warning(f"Rate limit exceeded for IP: {client_ip}")
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail="Rate limit exceeded. Please try again later."
                 )
             
-            # Add current request timestamp
-            if client_ip not in request_counts:
-                request_counts[client_ip] = []
-            request_counts[client_ip].append(current_time)
-            
             return await func(request, *args, **kwargs)
         return wrapper
     return decorator
 
+def _default_cache_key(kwargs: dict) -> str:
+    """Build a cache key suffix from an endpoint's scalar parameters."""
+    return ":".join(
+        f"{name}={value}" for name, value in sorted(kwargs.items())
+        if isinstance(value, (str, int, float, bool, type(None)))
+    )
+
+def cache_result(ttl: int = 60, key: Optional[Callable[..., str]] = None):
+    """
+    Cache-aside decorator for read-heavy API endpoints.
+    
+    Serves the endpoint's result from Redis when present and only falls
+    through to the database on a miss. While one worker recomputes an
+    expired entry, the others wait briefly for it instead of all hitting
+    the database at once. The endpoint must return JSON-serialisable data.
+    
+    Args:
+        ttl: Seconds to keep a cached result
+        key: Optional function building the key suffix from the endpoint
+            arguments (defaults to its scalar keyword arguments)
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not get_settings().enable_caching:
+                return await func(*args, **kwargs)
+            
+            suffix = key(*args, **kwargs) if key else _default_cache_key(kwargs)
+            cache_key = f"{CACHE_KEY_PREFIX}:{func.__name__}:{suffix}"
+            redis = get_redis_client()
+            
+            try:
+                cached = await redis.get(cache_key)
+                if cached is None and not await redis.set(
+                    f"{cache_key}:lock", 1, nx=True, ex=CACHE_LOCK_SECONDS
+                ):
+                    # Another worker is recomputing this entry - give it a moment
+                    for _ in range(CACHE_LOCK_POLL_ATTEMPTS):
+                        await asyncio.sleep(CACHE_LOCK_POLL_INTERVAL)
+                        cached = await redis.get(cache_key)
+                        if cached is not None:
+                            break
+                if cached is not None:
+                    return orjson.loads(cached)
+            except RedisError as e:
+                logger.warning(f"Result cache unavailable, computing {func.__name__}: {e}")
+                return await func(*args, **kwargs)
+            
+            result = await func(*args, **kwargs)
+            
+            try:
+                await redis.setex(cache_key, ttl, orjson.dumps(result))
+                await redis.delete(f"{cache_key}:lock")
+            except RedisError as e:
+                logger.warning(f"Failed to cache result for {func.__name__}: {e}")
+            
+            return result
+        return wrapper
+    return decorator
+
+async def invalidate_cached_results(pattern: str = "*") -> int:
+    """
+    Drop cached endpoint results matching a key pattern.
+    
+    Args:
+        pattern: Glob pattern under the cache prefix (e.g. "get_system_stats:*")
+        
+    Returns:
+        Number of keys deleted
+    """
+    redis = get_redis_client()
+    keys = [k async for k in redis.scan_iter(match=f"{CACHE_KEY_PREFIX}:{pattern}")]
+    return await redis.delete(*keys) if keys else 0
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[dict]:
@@ -189,27 +312,10 @@ def validate_file_type(file_path: str) -> bool:
     if not file_path:
         return True  # Allow empty file paths
     
-    # Get file extension
-    extension = file_path.split('.')[-1].lower() if '.' in file_path else ''
-    
-    # Map extensions to supported languages
-    supported_extensions = {
-        'py': 'python',
-        'js': 'javascript', 
-        'ts': 'typescript',
-        'java': 'java',
-        'cpp': 'cpp',
-        'cc': 'cpp',
-        'cxx': 'cpp',
-        'c': 'c',
-        'h': 'c',
-        'go': 'go',
-        'rs': 'rust',
-        'php': 'php',
-        'rb': 'ruby',
-    }
+    # Get file extension without the leading dot
+    extension = os.path.splitext(file_path)[1][1:].lower()
     
-    return extension in supported_extensions
+    return extension in SUPPORTED_FILE_EXTENSIONS
 
 def get_request_id(request: Request) -> str:
     """
@@ -219,15 +325,8 @@ def get_request_id(request: Request) -> str:
     a unique identifier. The frontend can send an ID, or we'll
     generate one automatically.
     """
-    # Check if request ID was provided in headers
-    request_id = request.headers.get("X-Request-ID")
-    
-    if not request_id:
-        # Generate a simple request ID based on timestamp
-        import uuid
-        request_id = str(uuid.uuid4())[:8]
-    
-    return request_id
+    # Use the request ID from the headers, or generate a short random one
+    return request.headers.get("X-Request-ID") or uuid4().hex[:8]
 
 async def log_request_info(
     request: Request,
@@ -256,6 +355,7 @@ CommonDeps = {
     "db": Depends(get_database),
     "settings": Depends(get_settings),
     "github": Depends(get_github_client),
+    "analyzer": Depends(get_code_analyzer),
     "request_info": Depends(log_request_info),
 }
 
@@ -0,0 +1,62 @@
+"""
+API Middleware
+
+Custom ASGI middleware used by the application. Kept separate from the
+route definitions so the application factory can install it without
+pulling in any endpoint code.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+class CachedPreflightCORSMiddleware(CORSMiddleware):
+    """
+    CORS middleware with memoized preflight responses.
+
+    Browsers send the same OPTIONS preflight (origin, method, headers) over
+    and over; the response only depends on those three values, so it is
+    built once and replayed from an LRU cache. Allowed origins are held in
+    a frozenset for constant-time membership checks.
+    """
+
+    def __init__(self, app: ASGIApp, preflight_cache_size: int = 256, **kwargs):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI application to wrap
+            preflight_cache_size: Maximum number of distinct preflight responses kept
+            **kwargs: Options passed through to CORSMiddleware
+        """
+        super().__init__(app, **kwargs)
+        self.allow_origins = frozenset(self.allow_origins)
+        self._cached_preflight = lru_cache(maxsize=preflight_cache_size)(self._build_preflight)
+
+    def preflight_response(self, request_headers: Headers) -> Response:
+        """Return the (possibly cached) response for a preflight request."""
+        return self._cached_preflight(
+            request_headers["origin"],
+            request_headers["access-control-request-method"],
+            request_headers.get("access-control-request-headers"),
+        )
+
+    def _build_preflight(
+        self,
+        origin: str,
+        requested_method: str,
+        requested_headers: Optional[str]
+    ) -> Response:
+        """Build the preflight response for one origin/method/headers combination."""
+        headers = {
+            "origin": origin,
+            "access-control-request-method": requested_method,
+        }
+        if requested_headers is not None:
+            headers["access-control-request-headers"] = requested_headers
+
+        return super().preflight_response(request_headers=Headers(headers))
@@ -7,22 +7,45 @@ or the web dashboard) can interact with the AI code review system.
 Each route handles a specific type of request and returns appropriate responses.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Optional, AsyncIterator
+from datetime import timedelta
+from uuid import uuid4
+import asyncio
 import logging
+import time
+import orjson
+from redis.exceptions import RedisError
 
-from ..services.code_analyzer import CodeAnalyzer
-from ..services.github_integration import GitHubIntegration
-from ..utils.config import Settings
+from ..database.schemas import AnalysisRecord, RepositoryRecord, WebhookEventRecord
+from ..models.analysis import (
+    AnalysisRequest, AnalysisResult, BulkAnalysisRequest, SecurityIssue, create_analysis_summary,
+)
+from ..utils.config import get_settings
+from .dependencies import (
+    get_readonly_database,
+    get_code_analyzer,
+    get_redis_client,
+    cache_result,
+)
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+# orjson serializes the analysis payloads (nested lists, floats, unicode)
+# far faster than the stdlib json encoder
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Initialize the services
-settings = Settings()
-code_analyzer = CodeAnalyzer()
-github_integration = GitHubIntegration(settings.github_token)
+# Process start time for uptime reporting
+_started_at = time.monotonic()
+
+# Background analysis jobs live in Redis so any worker can report on them
+ANALYSIS_JOB_TTL = 3600  # seconds
+ANALYSIS_JOB_POLL_INTERVAL = 0.5
+ANALYSIS_JOB_STREAM_TIMEOUT = 300
+_FINISHED_JOB_STATES = frozenset({"completed", "failed"})
 
 # ... (rest of the routes remain the same, but update these specific functions)
 
@@ -40,43 +63,311 @@ async def health_check() -> Dict[str, str]:
         "version": "1.0.0"
     }
 
+@router.get("/stats")
+@cache_result(ttl=60)
+async def get_system_stats(db: AsyncSession = Depends(get_readonly_database)) -> Dict[str, Any]:
+    """
+    System-wide analysis statistics for the dashboard.
+    
+    The aggregates change slowly, so results are cached in Redis for a
+    minute rather than re-running the queries on every dashboard poll.
+    """
+    total_analyses, security_issues_found, average_quality_score = (await db.execute(
+        select(
+            func.count(AnalysisRecord.id),
+            func.coalesce(func.sum(AnalysisRecord.security_issues_count), 0),
+            func.coalesce(func.avg(AnalysisRecord.quality_score), 0.0),
+        )
+    )).one()
+    
+    pull_requests_processed = await db.scalar(
+        select(func.count(WebhookEventRecord.id)).where(
+            WebhookEventRecord.event_type == "pull_request",
+            WebhookEventRecord.status == "completed",
+        )
+    )
+    
+    active_repositories = await db.scalar(
+        select(func.count(RepositoryRecord.id)).where(RepositoryRecord.status == "active")
+    )
+    
+    return {
+        "total_analyses": total_analyses,
+        "pull_requests_processed": pull_requests_processed,
+        "security_issues_found": security_issues_found,
+        "average_quality_score": round(float(average_quality_score), 1),
+        "system_uptime": str(timedelta(seconds=int(time.monotonic() - _started_at))),
+        "active_repositories": active_repositories,
+    }
+
+@router.post("/analyze")
+async def analyze_code(
+    request: AnalysisRequest,
+    analyzer=Depends(get_code_analyzer),
+) -> Dict[str, Any]:
+    """
+    Analyze a piece of code and return the results in the response.
+    
+    Suited to small snippets; larger files should go through
+    POST /analyze/jobs so the request doesn't wait on model inference.
+    """
+    try:
+        result = await analyzer.analyze_code(request.code_content, request.file_path or "")
+    except Exception as e:
+        logger.error(f"Error analyzing {request.file_path}: {e}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
+    
+    return _analysis_payload(result, request.file_path)
+
+@router.post("/analyze/bulk")
+async def analyze_code_bulk(
+    request: BulkAnalysisRequest,
+    analyzer=Depends(get_code_analyzer),
+) -> Dict[str, Any]:
+    """
+    Analyze up to 50 files in one request.
+    
+    Files are analyzed concurrently, capped at max_concurrent_analyses at a
+    time so a large batch doesn't swamp the model backend. A file that
+    fails is reported in its own result without failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(get_settings().max_concurrent_analyses)
+    
+    async def analyze_one(file_request: AnalysisRequest) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await analyzer.analyze_code(
+                    file_request.code_content, file_request.file_path or ""
+                )
+            except Exception as e:
+                logger.error(f"Error analyzing {file_request.file_path}: {e}")
+                return {
+                    "status": "error",
+                    "file_path": file_request.file_path,
+                    "detail": f"Analysis failed: {e}",
+                }
+        return _analysis_payload(result, file_request.file_path)
+    
+    results = await asyncio.gather(*(analyze_one(file_request) for file_request in request.files))
+    
+    # Skipped non-code files carry a placeholder score; leave them out
+    analyzed = [result for result in results if result["status"] == "success"]
+    skipped_count = sum(1 for result in results if result["status"] == "skipped")
+    total_issues = sum(result["summary"]["total_issues"] for result in analyzed)
+    files_with_issues = sum(1 for result in analyzed if result["summary"]["total_issues"])
+    
+    return {
+        "status": "completed",
+        "total_files": len(results),
+        "results": results,
+        "summary": {
+            "total_issues": total_issues,
+            "average_quality_score": round(
+                sum(result["analysis"]["quality_score"] for result in analyzed) / len(analyzed), 1
+            ) if analyzed else 0.0,
+            "files_with_issues": files_with_issues,
+            "files_skipped": skipped_count,
+            "files_failed": len(results) - len(analyzed) - skipped_count,
+            "overall_recommendation": (
+                "Review flagged files before merge" if files_with_issues else "No issues found"
+            ),
+        },
+    }
+
+@router.post("/analyze/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis_job(
+    request: AnalysisRequest,
+    background_tasks: BackgroundTasks,
+    analyzer=Depends(get_code_analyzer),
+) -> Dict[str, str]:
+    """
+    Queue a code analysis and return immediately with a job ID.
+    
+    The analysis runs after the response is sent. Poll
+    GET /analyze/jobs/{job_id} or follow GET /analyze/jobs/{job_id}/stream
+    for the result.
+    """
+    job_id = uuid4().hex
+    
+    try:
+        await _store_analysis_job(job_id, {"job_id": job_id, "status": "queued"})
+    except RedisError as e:
+        logger.error(f"Could not queue analysis job: {e}")
+        raise HTTPException(status_code=503, detail="Analysis queue unavailable")
+    
+    background_tasks.add_task(_run_analysis_job, job_id, request, analyzer)
+    
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/analyze/jobs/{job_id}")
+async def get_analysis_job(job_id: str) -> Dict[str, Any]:
+    """Return the current state of a background analysis job."""
+    return await _get_analysis_job_or_404(job_id)
+
+@router.get("/analyze/jobs/{job_id}/stream")
+async def stream_analysis_job(job_id: str) -> StreamingResponse:
+    """
+    Stream a background analysis job's progress as Server-Sent Events.
+    
+    Emits an event each time the job state changes (queued, running,
+    completed or failed) and closes once the job has finished.
+    """
+    await _get_analysis_job_or_404(job_id)
+    
+    return StreamingResponse(
+        _analysis_job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+def _analysis_job_key(job_id: str) -> str:
+    """Redis key holding the state of an analysis job."""
+    return f"job:analysis:{job_id}"
+
+async def _store_analysis_job(job_id: str, state: Dict[str, Any]) -> None:
+    """Save an analysis job's state."""
+    await get_redis_client().setex(
+        _analysis_job_key(job_id), ANALYSIS_JOB_TTL, orjson.dumps(state)
+    )
+
+async def _load_analysis_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Load an analysis job's state, or None if it is unknown or expired."""
+    raw = await get_redis_client().get(_analysis_job_key(job_id))
+    return orjson.loads(raw) if raw else None
+
+async def _get_analysis_job_or_404(job_id: str) -> Dict[str, Any]:
+    """Load an analysis job's state, raising an HTTP error if unavailable."""
+    try:
+        job = await _load_analysis_job(job_id)
+    except RedisError as e:
+        logger.error(f"Could not load analysis job {job_id}: {e}")
+        raise HTTPException(status_code=503, detail="Analysis queue unavailable")
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    
+    return job
+
+async def _run_analysis_job(job_id: str, request: AnalysisRequest, analyzer) -> None:
+    """Run a queued analysis and record its outcome."""
+    try:
+        await _store_analysis_job(job_id, {"job_id": job_id, "status": "running"})
+        
+        try:
+            result = await analyzer.analyze_code(request.code_content, request.file_path or "")
+            state = {
+                "job_id": job_id,
+                "status": "completed",
+                "result": _analysis_payload(result, request.file_path),
+            }
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {e}")
+            state = {"job_id": job_id, "status": "failed", "error": f"Analysis failed: {e}"}
+        
+        await _store_analysis_job(job_id, state)
+        
+    except RedisError as e:
+        logger.error(f"Could not record state for analysis job {job_id}: {e}")
+
+async def _analysis_job_events(job_id: str) -> AsyncIterator[bytes]:
+    """Yield SSE messages for each state change of an analysis job."""
+    deadline = time.monotonic() + ANALYSIS_JOB_STREAM_TIMEOUT
+    last_state = None
+    
+    while time.monotonic() < deadline:
+        try:
+            state = await _load_analysis_job(job_id)
+        except RedisError as e:
+            logger.error(f"Stopped streaming analysis job {job_id}: {e}")
+            return
+        
+        if state is None:
+            return
+        
+        if state != last_state:
+            yield b"event: " + state["status"].encode() + b"\ndata: " + orjson.dumps(state) + b"\n\n"
+            last_state = state
+        
+        if state["status"] in _FINISHED_JOB_STATES:
+            return
+        
+        await asyncio.sleep(ANALYSIS_JOB_POLL_INTERVAL)
+
+def _analysis_payload(analysis_result, file_path: Optional[str]) -> Dict[str, Any]:
+    """Shape analyzer output into the /analyze response body."""
+    security_issues = analysis_result.security_issues
+    
+    # Analyzer output is trusted; wrap it without re-validating so the
+    # shared summary helper can read it
+    summary_input = AnalysisResult.model_construct(
+        security_issues=[SecurityIssue.model_construct(**issue) for issue in security_issues],
+        quality_score=analysis_result.quality_score,
+        suggestions=analysis_result.suggestions,
+        documentation=analysis_result.documentation,
+        complexity_analysis=analysis_result.complexity_analysis,
+        overall_rating=analysis_result.overall_rating,
+    )
+    
+    return {
+        "status": "skipped" if analysis_result.skipped else "success",
+        "file_path": file_path,
+        "analysis": {
+            "security_issues": security_issues,
+            "quality_score": analysis_result.quality_score,
+            "suggestions": analysis_result.suggestions,
+            "documentation": analysis_result.documentation,
+            "complexity": analysis_result.complexity_analysis,
+            "overall_rating": analysis_result.overall_rating,
+        },
+        "summary": create_analysis_summary(summary_input),
+    }
+
 def _format_analysis_comment(analysis_result, file_path: str) -> str:
     """Format analysis results into a nice comment for GitHub."""
-    comment = f"## 🤖 AI-CodeReview Analysis for `{file_path}`\n\n"
-    comment += f"**Overall Rating:** {analysis_result.overall_rating}\n"
-    comment += f"**Quality Score:** {analysis_result.quality_score:.1f}/100\n\n"
+    parts = [
+        f"## 🤖 AI-CodeReview Analysis for `{file_path}`\n\n",
+        f"**Overall Rating:** {analysis_result.overall_rating}\n",
+        f"**Quality Score:** {analysis_result.quality_score:.1f}/100\n\n",
+    ]
     
     if analysis_result.security_issues:
-        comment += "### 🔒 Security Issues Found:\n"
-        for issue in analysis_result.security_issues:
-            comment += f"- **{issue['severity']}**: {issue['description']}\n"
-        comment += "\n"
+        parts.append("### 🔒 Security Issues Found:\n")
+        parts.extend(
+            f"- **{issue['severity']}**: {issue['description']}\n"
+            for issue in analysis_result.security_issues
+        )
+        parts.append("\n")
     
     if analysis_result.suggestions:
-        comment += "### 💡 Suggestions for Improvement:\n"
-        for suggestion in analysis_result.suggestions[:3]:  # Limit to top 3
-            comment += f"- {suggestion}\n"
-        comment += "\n"
+        parts.append("### 💡 Suggestions for Improvement:\n")
+        parts.extend(
+            f"- {suggestion}\n"
+            for suggestion in analysis_result.suggestions[:3]  # Limit to top 3
+        )
+        parts.append("\n")
     
-    comment += f"### 📖 AI-Generated Documentation:\n{analysis_result.documentation}\n\n"
-    comment += "*This analysis was generated automatically by AI-CodeReview*"
+    parts.append(f"### 📖 AI-Generated Documentation:\n{analysis_result.documentation}\n\n")
+    parts.append("*This analysis was generated automatically by AI-CodeReview*")
     
-    return comment
+    return "".join(parts)
 
 def _format_summary_comment(analysis_summary: List[Dict], total_issues: int) -> str:
     """Format a summary comment for the entire pull request."""
-    comment = "## 🤖 AI-CodeReview - Pull Request Summary\n\n"
-    comment += f"**Total Files Analyzed:** {len(analysis_summary)}\n"
-    comment += f"**Total Issues Found:** {total_issues}\n\n"
+    parts = [
+        "## 🤖 AI-CodeReview - Pull Request Summary\n\n",
+        f"**Total Files Analyzed:** {len(analysis_summary)}\n",
+        f"**Total Issues Found:** {total_issues}\n\n",
+    ]
     
     if analysis_summary:
-        comment += "### 📊 File Analysis Results:\n"
-        for file_summary in analysis_summary:
-            status_emoji = "✅" if file_summary["issues_found"] == 0 else "⚠️"
-            comment += f"{status_emoji} `{file_summary['file']}` - "
-            comment += f"Quality: {file_summary['quality_score']:.1f}/100, "
-            comment += f"Issues: {file_summary['issues_found']}, "
-            comment += f"Rating: {file_summary['rating']}\n"
-    
-    comment += "\n*Powered by AI-CodeReview - Automated Code Review System*"
-    return comment
\ No newline at end of file
+        parts.append("### 📊 File Analysis Results:\n")
+        parts.extend(
+            f"{'✅' if file_summary['issues_found'] == 0 else '⚠️'} `{file_summary['file']}` - "
+            f"Quality: {file_summary['quality_score']:.1f}/100, "
+            f"Issues: {file_summary['issues_found']}, "
+            f"Rating: {file_summary['rating']}\n"
+            for file_summary in analysis_summary
+        )
+    
+    parts.append("\n*Powered by AI-CodeReview - Automated Code Review System*")
+    return "".join(parts)
\ No newline at end of file
@@ -5,15 +5,16 @@ SQLAlchemy engine and session management with connection pooling.
 Provides standardized database access patterns for the application.
 """
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.pool import StaticPool
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 import logging
 import os
 
-from ..utils.config import Settings
+from ..utils.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,23 +25,49 @@ Base = declarative_base()
 _engine = None
 _session_factory = None
 
+# Liveness query built once and reused by every health probe, so repeat
+# executions hit SQLAlchemy's compiled-statement cache
+_HEALTH_STMT = text("SELECT 1")
+
+# Async DBAPI drivers substituted for the plain URL schemes
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+def to_async_database_url(database_url: str) -> str:
+    """
+    Rewrite a plain database URL to use its async driver.
+    
+    URLs that already name a driver (e.g. ``postgresql+asyncpg://``)
+    are returned unchanged.
+    """
+    scheme, sep, rest = database_url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
 def get_database_engine(database_url: Optional[str] = None):
     """
-    Get or create database engine with connection pooling.
+    Get or create the async database engine with connection pooling.
+    
+    Queries run through asyncpg (PostgreSQL) or aiosqlite (SQLite) so
+    database I/O never blocks the event loop.
     
     Args:
         database_url: Database connection string
         
     Returns:
-        SQLAlchemy engine instance
+        SQLAlchemy AsyncEngine instance
     """
     global _engine
     
     if _engine is None:
+        settings = get_settings()
         if database_url is None:
-            settings = Settings()
             database_url = settings.database_url
         
+        database_url = to_async_database_url(database_url)
+        
         # Engine configuration based on database type
         if database_url.startswith("sqlite"):
             # SQLite-specific configuration
@@ -53,6 +80,18 @@ def get_database_engine(database_url: Optional[str] = None):
                 "connect_args": connect_args,
                 "echo": False,
             }
+        elif settings.use_pgbouncer:
+            # Behind PgBouncer a pre-ping SELECT 1 costs a round-trip per
+            # checkout and can leave server connections idle in transaction,
+            # so rely on a short recycle interval for freshness instead
+            engine_kwargs = {
+                "pool_size": 10,
+                "max_overflow": 5,
+                "pool_timeout": 30,
+                "pool_recycle": 60,
+                "pool_pre_ping": False,
+                "echo": False,
+            }
         else:
             # PostgreSQL/MySQL configuration
             engine_kwargs = {
@@ -60,63 +99,101 @@ def get_database_engine(database_url: Optional[str] = None):
                 "max_overflow": 20,
                 "pool_timeout": 30,
                 "pool_recycle": 3600,  # 1 hour
-                "pool_pre_ping": True,
+                "pool_pre_ping": settings.database_pool_pre_ping,
                 "echo": False,
             }
         
-        _engine = create_engine(database_url, **engine_kwargs)
+        if database_url.startswith("postgresql+asyncpg"):
+            # Prepared statements skip re-planning the hot analysis queries,
+            # but PgBouncer in transaction mode cannot keep them per client.
+            # Short OLTP queries never benefit from JIT compilation. Behind
+            # PgBouncer, "jit" must be listed in ignore_startup_parameters.
+            engine_kwargs["connect_args"] = {
+                "statement_cache_size": 0 if settings.use_pgbouncer else 1024,
+                "prepared_statement_cache_size": 0 if settings.use_pgbouncer else 500,
+                "server_settings": {"jit": "off"},
+            }
+        
+        # Batch executemany INSERTs into multi-row statements of up to 1000 rows
+        _engine = create_async_engine(
+            database_url,
+            insertmanyvalues_page_size=1000,
+            **engine_kwargs,
+        )
         
-        # Add connection event listeners
-        _setup_engine_events(_engine)
+        # Add connection event listeners (pool events live on the sync engine)
+        _setup_engine_events(_engine.sync_engine)
         
         logger.info(f"Database engine created: {database_url.split('://')[0]}")
     
     return _engine
 
 def get_session_factory():
-    """Get or create session factory."""
+    """
+    Get or create session factory.
+    
+    FastAPI hands each request its own session through dependency
+    injection, so a plain sessionmaker is used rather than a thread-local
+    scoped_session registry. expire_on_commit=False keeps returned objects
+    readable after commit without another round-trip.
+    """
     global _session_factory
     
     if _session_factory is None:
         engine = get_database_engine()
-        _session_factory = scoped_session(
-            sessionmaker(
-                autocommit=False,
-                autoflush=False,
-                bind=engine
-            )
+        _session_factory = async_sessionmaker(
+            engine,
+            autoflush=False,
+            expire_on_commit=False,
         )
     
     return _session_factory
 
-def get_db_session() -> Generator[Session, None, None]:
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency for FastAPI.
     
-    Provides a database session that's automatically closed
-    after the request completes.
+    Provides an async database session that's automatically closed
+    after the request completes. Nothing is committed implicitly, so
+    read-only requests skip the COMMIT round-trip; endpoints that write
+    wrap their changes in ``async with db.begin():``. Uncommitted work is
+    rolled back when the session closes.
     
     Yields:
-        SQLAlchemy session instance
+        SQLAlchemy AsyncSession instance
     """
     session_factory = get_session_factory()
-    db = session_factory()
     
-    try:
+    async with session_factory() as db:
+        yield db
+
+def _reject_readonly_flush(session, flush_context, instances) -> None:
+    """Refuse to flush pending changes from a read-only session."""
+    raise InvalidRequestError("Attempted to flush changes in a read-only database session")
+
+async def get_readonly_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency for FastAPI.
+    
+    Same as get_db_session, but marks the session with
+    ``info["readonly"]`` and raises if anything tries to flush through it.
+    
+    Yields:
+        SQLAlchemy AsyncSession instance
+    """
+    session_factory = get_session_factory()
+    
+    async with session_factory() as db:
+        db.info["readonly"] = True
+        event.listen(db.sync_session, "before_flush", _reject_readonly_flush)
         yield db
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
 
 async def create_tables(engine=None) -> None:
     """
     Create all database tables if they don't exist.
     
     Args:
-        engine: SQLAlchemy engine (uses default if None)
+        engine: SQLAlchemy AsyncEngine (uses default if None)
     """
     if engine is None:
         engine = get_database_engine()
@@ -126,7 +203,8 @@ async def create_tables(engine=None) -> None:
         from . import schemas
         
         # Create tables
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created successfully")
         
     except Exception as e:
@@ -138,47 +216,59 @@ async def drop_tables(engine=None) -> None:
     Drop all database tables (use with caution).
     
     Args:
-        engine: SQLAlchemy engine (uses default if None)
+        engine: SQLAlchemy AsyncEngine (uses default if None)
     """
     if engine is None:
         engine = get_database_engine()
     
     try:
-        Base.metadata.drop_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
         logger.warning("All database tables dropped")
         
     except Exception as e:
         logger.error(f"Failed to drop database tables: {e}")
         raise
 
-def close_database_connections() -> None:
+async def close_database_connections() -> None:
     """Close all database connections and clean up resources."""
     global _engine, _session_factory
     
-    if _session_factory:
-        _session_factory.remove()
-        _session_factory = None
+    _session_factory = None
     
     if _engine:
-        _engine.dispose()
+        await _engine.dispose()
         _engine = None
         logger.info("Database connections closed")
 
+# Applied to every new SQLite connection in a single executescript call
+_SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON;"      # Enable foreign key constraints
+    "PRAGMA journal_mode=WAL;"     # Better read/write concurrency
+    "PRAGMA synchronous=NORMAL;"   # Safe with WAL, fewer fsyncs
+    "PRAGMA cache_size=-64000;"    # 64 MB page cache
+    "PRAGMA mmap_size=268435456;"  # 256 MB memory-mapped reads
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Set SQLite pragmas for better performance and reliability."""
+    # aiosqlite's adapted connection exposes the async driver connection
+    # through run_async; executescript sends all pragmas in one call
+    dbapi_connection.run_async(
+        lambda driver_connection: driver_connection.executescript(_SQLITE_PRAGMAS)
+    )
+
 def _setup_engine_events(engine) -> None:
     """Setup database engine event listeners for monitoring."""
     
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        """Set SQLite pragmas for better performance and reliability."""
-        if engine.url.drivername == "sqlite":
-            cursor = dbapi_connection.cursor()
-            # Enable foreign key constraints
-            cursor.execute("PRAGMA foreign_keys=ON")
-            # Set journal mode for better concurrency
-            cursor.execute("PRAGMA journal_mode=WAL")
-            # Set synchronous mode for better performance
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.close()
+    # Only SQLite engines pay for the connect hook
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    
+    # Pool tracing runs on every checkout/checkin, so only hook it up when
+    # DEBUG logging is enabled at startup
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     
     @event.listens_for(engine, "checkout")
     def receive_checkout(dbapi_connection, connection_record, connection_proxy):
@@ -202,8 +292,8 @@ async def check_database_health() -> dict:
         engine = get_database_engine()
         
         # Test connection with simple query
-        with engine.connect() as conn:
-            result = conn.execute("SELECT 1").scalar()
+        async with engine.connect() as conn:
+            await conn.execute(_HEALTH_STMT)
             
         return {
             "status": "healthy",
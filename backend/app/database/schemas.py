@@ -7,19 +7,36 @@ Defines the structure and relationships for persistent data storage.
 
 from sqlalchemy import (
     Column, Integer, String, DateTime, Text, Boolean, 
-    ForeignKey, JSON, Float, Index
+    ForeignKey, JSON, Float, Index, select, insert, text
 )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
+import orjson
 
 from .connection import Base
 
+# Binary JSONB on PostgreSQL (parsed once on write, indexable); generic JSON
+# elsewhere so SQLite development databases keep working
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class TimestampMixin:
-    """Mixin for automatic timestamp columns."""
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    """
+    Mixin for automatic timestamp columns.
+    
+    Timestamps are generated by the database (server_default) instead of
+    being bound as parameters. updated_at keeps an onupdate so UPDATE
+    statements set it without needing a database trigger. eager_defaults
+    reads both values back through RETURNING, so they never trigger a
+    lazy refresh on an async session.
+    """
+    __mapper_args__ = {"eager_defaults": True}
+    
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
 class AnalysisRecord(Base, TimestampMixin):
     """
@@ -30,19 +47,24 @@ class AnalysisRecord(Base, TimestampMixin):
     """
     __tablename__ = 'analysis_records'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     analysis_id = Column(String(50), unique=True, nullable=False, index=True)
     file_path = Column(String(500), nullable=False)
-    repository_id = Column(Integer, ForeignKey('repositories.id'), nullable=True)
+    repository_id = Column(Integer, ForeignKey('repositories.id', ondelete='CASCADE'), nullable=True)
     branch = Column(String(100), nullable=True)
     commit_sha = Column(String(40), nullable=True, index=True)
     
     # Analysis results stored as JSON
-    analysis_result = Column(JSON, nullable=False)
-    quality_score = Column(Float, nullable=True, index=True)
+    analysis_result = Column(JSONType, nullable=False)
+    quality_score = Column(Float, nullable=True)
     security_issues_count = Column(Integer, default=0)
     overall_rating = Column(String(20), nullable=True)
     
+    # Summary fields derived from analysis_result at insert, so list and
+    # summary queries never need to parse the JSON document
+    has_high_severity = Column(Boolean, default=False)
+    security_risk_level = Column(String(10), nullable=True, index=True)  # LOW, MEDIUM, HIGH
+    
     # Analysis metadata
     language = Column(String(50), nullable=True)
     file_size = Column(Integer, nullable=True)
@@ -51,9 +73,14 @@ class AnalysisRecord(Base, TimestampMixin):
     # Relationships
     repository = relationship("RepositoryRecord", back_populates="analyses")
     
-    # Indexes for common queries
+    # Indexes for common queries. Ad-hoc analyses (no repository) never
+    # appear in per-repository listings, so they are left out of that index.
     __table_args__ = (
-        Index('idx_analysis_repo_created', 'repository_id', 'created_at'),
+        Index(
+            'idx_analysis_repo_active', 'repository_id', 'created_at',
+            postgresql_where=text('repository_id IS NOT NULL'),
+            sqlite_where=text('repository_id IS NOT NULL'),
+        ),
         Index('idx_analysis_quality_created', 'quality_score', 'created_at'),
     )
     
@@ -88,24 +115,52 @@ class RepositoryRecord(Base, TimestampMixin):
     auto_analysis = Column(Boolean, default=True)
     webhook_url = Column(String(500), nullable=True)
     webhook_secret = Column(String(255), nullable=True)
-    analysis_config = Column(JSON, nullable=True)
+    analysis_config = Column(JSONType, nullable=True)
     
     # Statistics
     total_analyses = Column(Integer, default=0)
     last_analysis_at = Column(DateTime, nullable=True)
     
-    # Relationships
-    analyses = relationship("AnalysisRecord", back_populates="repository", cascade="all, delete-orphan")
-    webhook_events = relationship("WebhookEventRecord", back_populates="repository", cascade="all, delete-orphan")
+    # Relationships. Collections never load implicitly: queries that need
+    # them opt in with selectinload(), and deletes cascade in the database.
+    analyses = relationship(
+        "AnalysisRecord",
+        back_populates="repository",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
+    webhook_events = relationship(
+        "WebhookEventRecord",
+        back_populates="repository",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
     
     def __repr__(self):
         return f"<RepositoryRecord(id={self.id}, name='{self.full_name}', status='{self.status}')>"
     
-    def update_analysis_stats(self):
-        """Update analysis statistics for this repository."""
-        self.total_analyses = len(self.analyses)
-        if self.analyses:
-            self.last_analysis_at = max(analysis.created_at for analysis in self.analyses)
+    async def update_analysis_stats(self, session: AsyncSession):
+        """
+        Update analysis statistics for this repository.
+        
+        Counts are computed by the database in one aggregate query rather
+        than by loading every related AnalysisRecord into Python.
+        
+        Args:
+            session: Session used to run the aggregate query
+        """
+        total_analyses, last_analysis_at = (await session.execute(
+            select(
+                func.count(AnalysisRecord.id),
+                func.max(AnalysisRecord.created_at),
+            ).where(AnalysisRecord.repository_id == self.id)
+        )).one()
+        
+        self.total_analyses = total_analyses
+        if last_analysis_at is not None:
+            self.last_analysis_at = last_analysis_at
 
 class UserRecord(Base, TimestampMixin):
     """
@@ -127,7 +182,7 @@ class UserRecord(Base, TimestampMixin):
     is_verified = Column(Boolean, default=False)
     
     # User preferences
-    preferences = Column(JSON, nullable=True)
+    preferences = Column(JSONType, nullable=True)
     
     # GitHub integration
     github_username = Column(String(100), nullable=True, index=True)
@@ -145,20 +200,20 @@ class WebhookEventRecord(Base, TimestampMixin):
     """
     __tablename__ = 'webhook_events'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     event_id = Column(String(50), unique=True, nullable=False, index=True)
-    event_type = Column(String(50), nullable=False, index=True)
+    event_type = Column(String(50), nullable=False)
     
     # Event source
-    repository_id = Column(Integer, ForeignKey('repositories.id'), nullable=True)
+    repository_id = Column(Integer, ForeignKey('repositories.id', ondelete='CASCADE'), nullable=True)
     sender = Column(String(100), nullable=True)
     
     # Event data
-    payload = Column(JSON, nullable=False)
-    headers = Column(JSON, nullable=True)
+    payload = Column(JSONType, nullable=False)
+    headers = Column(JSONType, nullable=True)
     
     # Processing status
-    status = Column(String(20), default='received', index=True)  # received, processing, completed, failed
+    status = Column(String(20), default='received')  # received, processing, completed, failed
     processing_started_at = Column(DateTime, nullable=True)
     processing_completed_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
@@ -170,34 +225,66 @@ class WebhookEventRecord(Base, TimestampMixin):
     # Relationships
     repository = relationship("RepositoryRecord", back_populates="webhook_events")
     
-    # Indexes for common queries
+    # Indexes for common queries. Leading columns of these composites serve
+    # single-column lookups, so status and event_type carry no own index.
+    # Completed events make up most of the table but are rarely queried by
+    # status, so the status/time index only covers the active ones.
     __table_args__ = (
         Index('idx_webhook_type_created', 'event_type', 'created_at'),
-        Index('idx_webhook_status_created', 'status', 'created_at'),
+        Index('idx_webhook_status_type_created', 'status', 'event_type', 'created_at'),
+        Index(
+            'idx_webhook_active', 'status', 'created_at',
+            postgresql_where=text("status != 'completed'"),
+            sqlite_where=text("status != 'completed'"),
+        ),
         Index('idx_webhook_repo_created', 'repository_id', 'created_at'),
+        # Containment lookups (payload @> '{...}') on PostgreSQL
+        Index(
+            'idx_webhook_payload_gin', 'payload',
+            postgresql_using='gin',
+            postgresql_ops={'payload': 'jsonb_path_ops'},
+        ).ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self):
         return f"<WebhookEventRecord(id={self.id}, type='{self.event_type}', status='{self.status}')>"
     
+    # Timestamps are set in Python rather than as func.now() expressions so
+    # several state changes made before a flush collapse into one UPDATE
     def mark_processing_started(self):
         """Mark webhook event as processing started."""
         self.status = 'processing'
-        self.processing_started_at = func.now()
-    
-    def mark_processing_completed(self, analysis_id: Optional[str] = None):
-        """Mark webhook event as processing completed."""
-        self.status = 'completed'
-        self.processing_completed_at = func.now()
+        self.processing_started_at = datetime.utcnow()
+    
+    def mark_processing_result(
+        self,
+        status: str,
+        analysis_id: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Record the outcome of processing in a single state change.
+        
+        Args:
+            status: Final status ('completed' or 'failed')
+            analysis_id: Analysis triggered by this event, if any
+            error: Error message when processing failed
+        """
+        self.status = status
+        self.processing_completed_at = datetime.utcnow()
         if analysis_id:
             self.analysis_triggered = True
             self.analysis_id = analysis_id
+        if error is not None:
+            self.error_message = error
+    
+    def mark_processing_completed(self, analysis_id: Optional[str] = None):
+        """Mark webhook event as processing completed."""
+        self.mark_processing_result('completed', analysis_id=analysis_id)
     
     def mark_processing_failed(self, error_message: str):
         """Mark webhook event as processing failed."""
-        self.status = 'failed'
-        self.processing_completed_at = func.now()
-        self.error_message = error_message
+        self.mark_processing_result('failed', error=error_message)
 
 class SystemMetric(Base, TimestampMixin):
     """
@@ -211,7 +298,7 @@ class SystemMetric(Base, TimestampMixin):
     metric_name = Column(String(100), nullable=False, index=True)
     metric_value = Column(Float, nullable=False)
     metric_unit = Column(String(20), nullable=True)
-    tags = Column(JSON, nullable=True)  # Additional metadata
+    tags = Column(JSONType, nullable=True)  # Additional metadata
     
     # Indexes for time-series queries
     __table_args__ = (
@@ -222,6 +309,43 @@ class SystemMetric(Base, TimestampMixin):
         return f"<SystemMetric(name='{self.metric_name}', value={self.metric_value})>"
 
 # Utility functions for common database operations
+def _security_risk_level(security_issues: List[Dict[str, Any]]) -> str:
+    """Calculate overall security risk level from raw issue dicts."""
+    if any(issue.get('severity') == 'HIGH' for issue in security_issues):
+        return "HIGH"
+    elif len(security_issues) > 3:
+        return "MEDIUM"
+    else:
+        return "LOW"
+
+def analysis_record_values(
+    analysis_id: str,
+    file_path: str,
+    analysis_result: Dict[str, Any],
+    repository_id: Optional[int] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Build the column values for an analysis record.
+    
+    Returned as a plain dict so many rows can be written with a single
+    executemany ``insert(AnalysisRecord)`` instead of one INSERT per row.
+    """
+    security_issues = analysis_result.get('security_issues', [])
+    
+    return {
+        "analysis_id": analysis_id,
+        "file_path": file_path,
+        "analysis_result": analysis_result,
+        "repository_id": repository_id,
+        "quality_score": analysis_result.get('quality_score'),
+        "security_issues_count": len(security_issues),
+        "overall_rating": analysis_result.get('overall_rating'),
+        "has_high_severity": any(issue.get('severity') == 'HIGH' for issue in security_issues),
+        "security_risk_level": _security_risk_level(security_issues),
+        **kwargs
+    }
+
 def create_analysis_record(
     analysis_id: str,
     file_path: str,
@@ -231,16 +355,59 @@ def create_analysis_record(
 ) -> AnalysisRecord:
     """Create a new analysis record with validation."""
     return AnalysisRecord(
-        analysis_id=analysis_id,
-        file_path=file_path,
-        analysis_result=analysis_result,
-        repository_id=repository_id,
-        quality_score=analysis_result.get('quality_score'),
-        security_issues_count=len(analysis_result.get('security_issues', [])),
-        overall_rating=analysis_result.get('overall_rating'),
-        **kwargs
+        **analysis_record_values(
+            analysis_id, file_path, analysis_result, repository_id, **kwargs
+        )
     )
 
+async def bulk_create_analysis_records(
+    session: AsyncSession,
+    records: List[Dict[str, Any]]
+) -> int:
+    """
+    Insert many analysis records with a single executemany statement.
+    
+    Each entry takes the same arguments as create_analysis_record. Rows go
+    through Core insert() so the driver can batch them (insertmanyvalues)
+    instead of the unit of work flushing one INSERT per object.
+    
+    Args:
+        session: Session to execute the insert on
+        records: Keyword arguments for each analysis record
+        
+    Returns:
+        Number of rows inserted
+    """
+    if not records:
+        return 0
+    
+    rows = [analysis_record_values(**record) for record in records]
+    await session.execute(insert(AnalysisRecord), rows)
+    return len(rows)
+
+def webhook_event_values(
+    event_id: str,
+    event_type: str,
+    payload: Dict[str, Any],
+    repository_id: Optional[int] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Build the column values for a webhook event record.
+    
+    Python-side column defaults are filled in here because bulk paths
+    (executemany, COPY) bypass the ORM that would otherwise apply them.
+    """
+    return {
+        "event_id": event_id,
+        "event_type": event_type,
+        "payload": payload,
+        "repository_id": repository_id,
+        "status": "received",
+        "analysis_triggered": False,
+        **kwargs
+    }
+
 def create_webhook_event(
     event_id: str,
     event_type: str,
@@ -250,9 +417,56 @@ def create_webhook_event(
 ) -> WebhookEventRecord:
     """Create a new webhook event record."""
     return WebhookEventRecord(
-        event_id=event_id,
-        event_type=event_type,
-        payload=payload,
-        repository_id=repository_id,
-        **kwargs
-    )
\ No newline at end of file
+        **webhook_event_values(event_id, event_type, payload, repository_id, **kwargs)
+    )
+
+# JSONB columns are handed to COPY as serialized text
+_WEBHOOK_JSON_COLUMNS = frozenset({"payload", "headers"})
+
+def _copy_record(row: Dict[str, Any], columns: List[str]) -> tuple:
+    """Order a webhook row for COPY, serializing its JSON columns."""
+    return tuple(
+        orjson.dumps(row[column]).decode()
+        if column in _WEBHOOK_JSON_COLUMNS and row[column] is not None
+        else row[column]
+        for column in columns
+    )
+
+async def bulk_persist_webhook_events(
+    engine: AsyncEngine,
+    events: Iterable[Dict[str, Any]]
+) -> int:
+    """
+    Persist a burst of webhook events in one round trip.
+    
+    Each entry takes the same arguments as create_webhook_event. On
+    PostgreSQL (asyncpg) the rows are streamed with COPY FROM STDIN; other
+    backends fall back to a single executemany insert. All rows must carry
+    the same set of columns.
+    
+    Args:
+        engine: Engine to write through
+        events: Keyword arguments for each webhook event
+        
+    Returns:
+        Number of rows inserted
+    """
+    rows = [webhook_event_values(**event) for event in events]
+    if not rows:
+        return 0
+    
+    async with engine.connect() as conn:
+        if engine.dialect.driver == "asyncpg":
+            columns = list(rows[0])
+            records = [_copy_record(row, columns) for row in rows]
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                WebhookEventRecord.__tablename__,
+                records=records,
+                columns=columns,
+            )
+        else:
+            await conn.execute(insert(WebhookEventRecord), rows)
+            await conn.commit()
+    
+    return len(rows)
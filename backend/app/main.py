@@ -9,15 +9,15 @@ coordinates the analysis, and sends back results.
 """
 
 from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from contextlib import asynccontextmanager
 import logging
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 
-from .services.code_analyzer import CodeAnalyzer
-from .services.github_integration import GitHubIntegration
 from .api.routes import router
-from .utils.config import Settings
+from .api.dependencies import get_code_analyzer, get_github_client
+from .api.middleware import CachedPreflightCORSMiddleware
+from .utils.config import get_settings
 
 # Configure logging to track what the system is doing
 logging.basicConfig(
@@ -36,26 +36,44 @@ class AICodeReviewApplication:
     
     def __init__(self):
         """Initialize the application with all necessary components."""
+        # Load configuration settings
+        self.settings = get_settings()
+        
         self.app = FastAPI(
             title="AI-CodeReview",
             description="AI-powered code review and security analysis system",
-            version="1.0.0"
+            version="1.0.0",
+            lifespan=self._lifespan,
+            # orjson for every endpoint, including those outside the API router
+            default_response_class=ORJSONResponse
         )
         
-        # Load configuration settings
-        self.settings = Settings()
+        # Set up the web application
+        self._setup_middleware()
+        self._setup_routes()
+        
+        logger.info("AI-CodeReview application initialized successfully")
+    
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """
+        Build heavy services when the server starts rather than at import.
         
+        Each worker loads the AI models once during startup, in parallel with
+        other workers, and importing the module (tests, tooling) stays cheap.
+        The instances are the same ones route dependencies hand out.
+        """
         # Initialize the AI analysis engine
-        self.code_analyzer = CodeAnalyzer()
+        app.state.code_analyzer = get_code_analyzer()
         
         # Initialize GitHub integration for fetching code
-        self.github_integration = GitHubIntegration(self.settings.github_token)
+        app.state.github_integration = get_github_client(self.settings)
         
-        # Set up the web application
-        self._setup_middleware()
-        self._setup_routes()
+        logger.info("AI-CodeReview services started")
+        yield
         
-        logger.info("AI-CodeReview application initialized successfully")
+        # Release pooled GitHub connections
+        await app.state.github_integration.close()
     
     def _setup_middleware(self):
         """
@@ -64,10 +82,12 @@ class AICodeReviewApplication:
         Middleware is similar to security guards and translators at the entrance -
         they handle authentication, enable cross-origin requests, etc.
         """
+        # Preflight responses are memoized; origins come from settings
+        # (CORS_ORIGINS) and should list exact domains in production
         self.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],  # In production, specify exact domains
-            allow_credentials=True,
+            CachedPreflightCORSMiddleware,
+            allow_origins=tuple(self.settings.cors_origins),
+            allow_credentials=self.settings.cors_allow_credentials,
             allow_methods=["*"],
             allow_headers=["*"],
         )
@@ -81,9 +101,12 @@ class AICodeReviewApplication:
             """Simple endpoint to check if the system is running."""
             return {"status": "healthy", "service": "AI-CodeReview"}
 
-# Create the application instance
-app_instance = AICodeReviewApplication()
-app = app_instance.app
+def create_app() -> FastAPI:
+    """Create a configured FastAPI application."""
+    return AICodeReviewApplication().app
+
+# Application used by uvicorn (``app.main:app``)
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
@@ -21,6 +21,7 @@ from .analysis import (
     ComplexityMetrics,
     AnalysisLanguage,
     SecuritySeverity,
+    SecurityIssueType,
     ComplexityRating,
     create_analysis_summary
 )
@@ -56,6 +57,7 @@ __all__ = [
     "ComplexityMetrics",
     "AnalysisLanguage",
     "SecuritySeverity", 
+    "SecurityIssueType",
     "ComplexityRating",
     "create_analysis_summary",
     
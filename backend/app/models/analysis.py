@@ -5,10 +5,13 @@ Pydantic models for code analysis requests, responses, and internal data structu
 These models handle validation, serialization, and type safety for all analysis operations.
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+from typing import List, Dict, Any, Optional, Union, Tuple
 from datetime import datetime
+from collections import Counter
+from functools import lru_cache
 from enum import Enum
+import sys
 
 class AnalysisLanguage(str, Enum):
     """Supported programming languages for analysis."""
@@ -29,6 +32,16 @@ class SecuritySeverity(str, Enum):
     MEDIUM = "MEDIUM"
     LOW = "LOW"
 
+class SecurityIssueType(str, Enum):
+    """Security issue categories reported by the analyzer."""
+    SQL_INJECTION = "SQL injection vulnerabilities"
+    XSS = "Cross-site scripting (XSS) risks"
+    AUTH_BYPASS = "Authentication bypasses"
+    DATA_EXPOSURE = "Data exposure risks"
+
+# Value -> member lookup for issue types, avoiding Enum's own lookup machinery
+_SECURITY_ISSUE_TYPES = {member.value: member for member in SecurityIssueType}
+
 class ComplexityRating(str, Enum):
     """Code complexity ratings."""
     LOW = "LOW"
@@ -37,22 +50,30 @@ class ComplexityRating(str, Enum):
 
 class SecurityIssue(BaseModel):
     """Individual security vulnerability found in code."""
-    type: str = Field(..., description="Type of security issue")
+    type: Union[SecurityIssueType, str] = Field(..., description="Type of security issue")
     severity: SecuritySeverity = Field(..., description="Issue severity level")
     confidence: float = Field(..., ge=0.0, le=1.0, description="AI confidence score")
     description: str = Field(..., description="Human-readable issue description")
     line_number: Optional[int] = Field(None, description="Line number where issue occurs")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "type": "SQL injection vulnerabilities",
-                "severity": "HIGH",
-                "confidence": 0.85,
-                "description": "Potential SQL injection detected in query construction",
-                "line_number": 42
-            }
+    # Frozen: immutable once validated and hashable by value
+    model_config = ConfigDict(frozen=True, json_schema_extra={
+        "example": {
+            "type": "SQL injection vulnerabilities",
+            "severity": "HIGH",
+            "confidence": 0.85,
+            "description": "Potential SQL injection detected in query construction",
+            "line_number": 42
         }
+    })
+    
+    @field_validator('type', mode='before')
+    @classmethod
+    def normalize_type(cls, v):
+        """Map known issue types to their enum member and intern the rest."""
+        if isinstance(v, str):
+            return _SECURITY_ISSUE_TYPES.get(v) or sys.intern(v)
+        return v
 
 class ComplexityMetrics(BaseModel):
     """Code complexity analysis metrics."""
@@ -63,10 +84,13 @@ class ComplexityMetrics(BaseModel):
     class_count: int = Field(..., ge=0, description="Number of classes")
     complexity_rating: ComplexityRating = Field(..., description="Overall complexity rating")
     
-    @validator('code_lines')
-    def code_lines_not_exceed_total(cls, v, values):
+    model_config = ConfigDict(frozen=True)
+    
+    @field_validator('code_lines')
+    @classmethod
+    def code_lines_not_exceed_total(cls, v: int, info: ValidationInfo) -> int:
         """Ensure code lines don't exceed total lines."""
-        if 'total_lines' in values and v > values['total_lines']:
+        if 'total_lines' in info.data and v > info.data['total_lines']:
             raise ValueError('Code lines cannot exceed total lines')
         return v
 
@@ -76,21 +100,21 @@ class AnalysisRequest(BaseModel):
     file_path: Optional[str] = Field(None, description="File path for context")
     language: AnalysisLanguage = Field(AnalysisLanguage.PYTHON, description="Programming language")
     
-    @validator('code_content')
-    def code_content_not_empty(cls, v):
+    @field_validator('code_content')
+    @classmethod
+    def code_content_not_empty(cls, v: str) -> str:
         """Ensure code content is not just whitespace."""
         if not v.strip():
             raise ValueError('Code content cannot be empty or whitespace only')
         return v
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "code_content": "def hello_world():\n    print('Hello, World!')",
-                "file_path": "example.py",
-                "language": "python"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "code_content": "def hello_world():\n    print('Hello, World!')",
+            "file_path": "example.py",
+            "language": "python"
         }
+    })
 
 class AnalysisResult(BaseModel):
     """Complete analysis results for a piece of code."""
@@ -102,24 +126,23 @@ class AnalysisResult(BaseModel):
     overall_rating: str = Field(..., description="Overall letter grade (A-F)")
     analysis_timestamp: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "security_issues": [],
-                "quality_score": 85.5,
-                "suggestions": ["Consider adding type hints", "Add error handling"],
-                "documentation": "This function prints a greeting message",
-                "complexity_analysis": {
-                    "total_lines": 10,
-                    "code_lines": 8,
-                    "comment_lines": 1,
-                    "function_count": 1,
-                    "class_count": 0,
-                    "complexity_rating": "LOW"
-                },
-                "overall_rating": "B - Good"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "security_issues": [],
+            "quality_score": 85.5,
+            "suggestions": ["Consider adding type hints", "Add error handling"],
+            "documentation": "This function prints a greeting message",
+            "complexity_analysis": {
+                "total_lines": 10,
+                "code_lines": 8,
+                "comment_lines": 1,
+                "function_count": 1,
+                "class_count": 0,
+                "complexity_rating": "LOW"
+            },
+            "overall_rating": "B - Good"
         }
+    })
 
 class AnalysisResponse(BaseModel):
     """API response model for analysis requests."""
@@ -128,19 +151,18 @@ class AnalysisResponse(BaseModel):
     analysis: AnalysisResult = Field(..., description="Analysis results")
     summary: Dict[str, Any] = Field(..., description="Analysis summary")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "status": "success",
-                "file_path": "example.py",
-                "analysis": "...",  # AnalysisResult example
-                "summary": {
-                    "total_issues": 0,
-                    "security_risk_level": "LOW",
-                    "recommendation": "Code looks good! Ready for merge."
-                }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "status": "success",
+            "file_path": "example.py",
+            "analysis": "...",  # AnalysisResult example
+            "summary": {
+                "total_issues": 0,
+                "security_risk_level": "LOW",
+                "recommendation": "Code looks good! Ready for merge."
             }
         }
+    })
 
 class AnalysisHistory(BaseModel):
     """Historical analysis record for tracking and comparison."""
@@ -152,30 +174,23 @@ class AnalysisHistory(BaseModel):
     analysis_result: AnalysisResult = Field(..., description="Analysis results")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "id": "analysis_123456",
-                "file_path": "src/main.py",
-                "repository": "user/repo",
-                "branch": "feature/new-feature",
-                "commit_sha": "abc123def456",
-                "analysis_result": "...",  # AnalysisResult example
-                "created_at": "2025-06-01T20:20:00Z"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "id": "analysis_123456",
+            "file_path": "src/main.py",
+            "repository": "user/repo",
+            "branch": "feature/new-feature",
+            "commit_sha": "abc123def456",
+            "analysis_result": "...",  # AnalysisResult example
+            "created_at": "2025-06-01T20:20:00Z"
         }
+    })
 
 class BulkAnalysisRequest(BaseModel):
     """Request model for analyzing multiple files."""
-    files: List[AnalysisRequest] = Field(..., min_items=1, max_items=50)
+    # The 1-50 file bound is enforced by pydantic-core's length constraint
+    files: List[AnalysisRequest] = Field(..., min_length=1, max_length=50)
     repository_context: Optional[str] = Field(None, description="Repository context")
-    
-    @validator('files')
-    def validate_file_count(cls, v):
-        """Ensure reasonable number of files for bulk analysis."""
-        if len(v) > 50:
-            raise ValueError('Cannot analyze more than 50 files at once')
-        return v
 
 class BulkAnalysisResponse(BaseModel):
     """Response model for bulk analysis requests."""
@@ -184,56 +199,87 @@ class BulkAnalysisResponse(BaseModel):
     results: List[AnalysisResponse] = Field(..., description="Individual file results")
     summary: Dict[str, Any] = Field(..., description="Aggregate summary")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "status": "completed",
-                "total_files": 3,
-                "results": ["..."],  # List of AnalysisResponse
-                "summary": {
-                    "total_issues": 5,
-                    "average_quality_score": 78.5,
-                    "files_with_issues": 2,
-                    "overall_recommendation": "Review flagged files before merge"
-                }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "status": "completed",
+            "total_files": 3,
+            "results": ["..."],  # List of AnalysisResponse
+            "summary": {
+                "total_issues": 5,
+                "average_quality_score": 78.5,
+                "files_with_issues": 2,
+                "overall_recommendation": "Review flagged files before merge"
             }
         }
+    })
 
 # Utility functions for model operations
 def create_analysis_summary(analysis_result: AnalysisResult) -> Dict[str, Any]:
-    """Create summary statistics from analysis results."""
+    """
+    Create summary statistics from analysis results.
+    
+    Issue severities are tallied in a single pass. The remaining fields
+    only depend on the quality score, rating and HIGH/total issue counts,
+    so they are computed once per distinct fingerprint and served from an
+    LRU cache for repeat analyses.
+    """
+    severity_counts = Counter(issue.severity for issue in analysis_result.security_issues)
+    high_severity_count = severity_counts[SecuritySeverity.HIGH]
+    total_issues = len(analysis_result.security_issues)
+    
+    risk_level, recommendation, quality_grade = _summary_cached(
+        analysis_result.quality_score,
+        analysis_result.overall_rating,
+        high_severity_count,
+        total_issues,
+    )
     return {
-        "total_issues": len(analysis_result.security_issues),
-        "security_risk_level": _calculate_risk_level(analysis_result.security_issues),
-        "recommendation": _generate_recommendation(analysis_result),
-        "quality_grade": analysis_result.overall_rating.split(' - ')[0],
-        "has_high_severity_issues": any(
-            issue.severity == SecuritySeverity.HIGH 
-            for issue in analysis_result.security_issues
-        )
+        "total_issues": total_issues,
+        "security_risk_level": risk_level,
+        "recommendation": recommendation,
+        "quality_grade": quality_grade,
+        "has_high_severity_issues": high_severity_count > 0,
     }
 
+@lru_cache(maxsize=4096)
+def _summary_cached(
+    quality_score: float,
+    overall_rating: str,
+    high_severity_count: int,
+    total_issues: int
+) -> Tuple[str, str, str]:
+    """Compute summary fields for an analysis fingerprint."""
+    return (
+        _risk_from_counts(high_severity_count, total_issues),
+        _recommendation_for_score(quality_score),
+        overall_rating.split(' - ')[0],
+    )
+
 def _calculate_risk_level(security_issues: List[SecurityIssue]) -> str:
     """Calculate overall security risk level."""
-    if not security_issues:
-        return "LOW"
-    
-    high_severity_count = sum(1 for issue in security_issues if issue.severity == SecuritySeverity.HIGH)
-    
+    severity_counts = Counter(issue.severity for issue in security_issues)
+    return _risk_from_counts(severity_counts[SecuritySeverity.HIGH], len(security_issues))
+
+def _risk_from_counts(high_severity_count: int, total_issues: int) -> str:
+    """Calculate overall security risk level from issue counts."""
     if high_severity_count > 0:
         return "HIGH"
-    elif len(security_issues) > 3:
+    elif total_issues > 3:
         return "MEDIUM"
     else:
         return "LOW"
 
 def _generate_recommendation(analysis_result: AnalysisResult) -> str:
     """Generate human-readable recommendation based on analysis."""
-    if analysis_result.quality_score >= 90:
+    return _recommendation_for_score(analysis_result.quality_score)
+
+def _recommendation_for_score(quality_score: float) -> str:
+    """Map a quality score to a human-readable recommendation."""
+    if quality_score >= 90:
         return "Excellent code quality! Ready for merge."
-    elif analysis_result.quality_score >= 80:
+    elif quality_score >= 80:
         return "Good code quality with minor suggestions."
-    elif analysis_result.quality_score >= 70:
+    elif quality_score >= 70:
         return "Code quality is acceptable but could benefit from improvements."
     else:
-        return "Code quality needs significant improvement before merge."
\ No newline at end of file
+        return "Code quality needs significant improvement before merge."
@@ -6,10 +6,23 @@ and repository configuration. Handles validation and serialization
 for all repository-related operations.
 """
 
-from pydantic import BaseModel, Field, validator, HttpUrl
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, ValidationInfo, computed_field, field_validator
+from typing import List, Dict, Any, Literal, Optional, Type, TypeVar, get_args
+from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
+import sys
+
+_UTC = timezone.utc
+
+def _now_utc() -> datetime:
+    """Timezone-aware current UTC time (datetime.utcnow is deprecated)."""
+    return datetime.now(_UTC)
+
+TrustedModel = TypeVar("TrustedModel", bound="TrustedConstructMixin")
+
+# Per-class map of field name -> nested trusted model, built on first use
+_TRUSTED_NESTED_FIELDS: Dict[type, Dict[str, type]] = {}
 
 class RepositoryStatus(str, Enum):
     """Repository analysis status."""
@@ -30,148 +43,247 @@ class WebhookEventType(str, Enum):
     PUSH = "push"
     PULL_REQUEST_REVIEW = "pull_request_review"
 
-class GitHubUser(BaseModel):
+# Field types for the enums above. Literal validates with a plain set
+# lookup and stores the str itself. The Enum classes remain as named
+# constants; use their .value when building models from them.
+RepositoryStatusValue = Literal["active", "inactive", "error", "pending"]
+PullRequestStateValue = Literal["open", "closed", "merged"]
+
+def _require_https(v: str) -> str:
+    """
+    Cheap URL sanity check for GitHub-provided URLs.
+    
+    GitHub URLs are well-formed by construction, so a prefix check stands
+    in for HttpUrl's full parse; HttpUrl is kept for user-supplied URLs.
+    """
+    if not v.startswith('https://'):
+        raise ValueError('URL must start with https://')
+    return v
+
+def _intern(v: Any) -> Any:
+    """
+    Intern low-cardinality strings (repository names, branches).
+    
+    The same few values arrive on every webhook, so sharing one object
+    per value saves memory and makes equality checks pointer compares.
+    Runs before type validation, so non-str input is passed through for
+    the field's own validation to reject.
+    """
+    return sys.intern(v) if isinstance(v, str) else v
+
+class TrustedConstructMixin:
+    """
+    Construction without validation for data that is already known good.
+    
+    Payloads from the GitHub API or our own caches have been validated
+    before, so running the full validator tree again is wasted work.
+    from_trusted() goes through model_construct() instead, recursing into
+    nested models that also use this mixin. Never use it for user input.
+    """
+    
+    @classmethod
+    def _trusted_nested_fields(cls) -> Dict[str, type]:
+        """Return the fields holding nested trusted models."""
+        nested = _TRUSTED_NESTED_FIELDS.get(cls)
+        if nested is None:
+            nested = {}
+            for name, field in cls.model_fields.items():
+                # Unwrap Optional[Model] to Model
+                for candidate in (field.annotation, *get_args(field.annotation)):
+                    if isinstance(candidate, type) and issubclass(candidate, TrustedConstructMixin):
+                        nested[name] = candidate
+                        break
+            _TRUSTED_NESTED_FIELDS[cls] = nested
+        return nested
+    
+    @classmethod
+    def from_trusted(cls: Type[TrustedModel], data: Dict[str, Any]) -> TrustedModel:
+        """
+        Build an instance from trusted data without validation.
+        
+        Args:
+            data: Field values, e.g. a GitHub API response or cached record
+            
+        Returns:
+            Model instance; unknown keys are dropped and defaults applied
+        """
+        values = dict(data)
+        for name, model in cls._trusted_nested_fields().items():
+            nested_data = values.get(name)
+            if isinstance(nested_data, dict):
+                values[name] = model.from_trusted(nested_data)
+        return cls.model_construct(**values)
+    
+    @classmethod
+    def from_trusted_list(cls: Type[TrustedModel], items: List[Dict[str, Any]]) -> List[TrustedModel]:
+        """Build instances from a list of trusted records."""
+        return [cls.from_trusted(item) for item in items]
+
+class GitHubUser(TrustedConstructMixin, BaseModel):
     """GitHub user information."""
     login: str = Field(..., description="GitHub username")
     id: int = Field(..., description="GitHub user ID")
-    avatar_url: HttpUrl = Field(..., description="User avatar URL")
-    html_url: HttpUrl = Field(..., description="User profile URL")
+    avatar_url: str = Field(..., description="User avatar URL")
+    html_url: str = Field(..., description="User profile URL")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "login": "octocat",
-                "id": 1,
-                "avatar_url": "https://github.com/images/error/octocat_happy.gif",
-                "html_url": "https://github.com/octocat"
-            }
+    @field_validator('avatar_url', 'html_url')
+    @classmethod
+    def _check_urls(cls, v: str) -> str:
+        """Require HTTPS for GitHub-provided URLs."""
+        return _require_https(v)
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "login": "octocat",
+            "id": 1,
+            "avatar_url": "https://github.com/images/error/octocat_happy.gif",
+            "html_url": "https://github.com/octocat"
         }
+    })
 
-class Repository(BaseModel):
+class Repository(TrustedConstructMixin, BaseModel):
     """GitHub repository information."""
     id: int = Field(..., description="GitHub repository ID")
     name: str = Field(..., description="Repository name")
     full_name: str = Field(..., description="Full repository name (owner/repo)")
     owner: GitHubUser = Field(..., description="Repository owner")
     description: Optional[str] = Field(None, description="Repository description")
-    html_url: HttpUrl = Field(..., description="Repository URL")
-    clone_url: HttpUrl = Field(..., description="Git clone URL")
+    html_url: str = Field(..., description="Repository URL")
+    clone_url: str = Field(..., description="Git clone URL")
     default_branch: str = Field(default="main", description="Default branch name")
     language: Optional[str] = Field(None, description="Primary language")
     private: bool = Field(..., description="Whether repository is private")
     
-    @validator('full_name')
-    def validate_full_name_format(cls, v):
+    @field_validator('html_url', 'clone_url')
+    @classmethod
+    def _check_urls(cls, v: str) -> str:
+        """Require HTTPS for GitHub-provided URLs."""
+        return _require_https(v)
+    
+    @field_validator('full_name')
+    @classmethod
+    def validate_full_name_format(cls, v: str) -> str:
         """Ensure full_name follows owner/repo format."""
-        if '/' not in v or len(v.split('/')) != 2:
+        owner, sep, repo = v.partition('/')
+        if not sep or not owner or not repo or '/' in repo:
             raise ValueError('full_name must be in format "owner/repo"')
-        return v
+        return sys.intern(v)
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "id": 1296269,
-                "name": "Hello-World",
-                "full_name": "octocat/Hello-World",
-                "owner": {"login": "octocat", "id": 1},
-                "description": "This your first repo!",
-                "html_url": "https://github.com/octocat/Hello-World",
-                "clone_url": "https://github.com/octocat/Hello-World.git",
-                "default_branch": "main",
-                "language": "Python",
-                "private": False
-            }
+    @field_validator('default_branch', mode='before')
+    @classmethod
+    def _intern_branch(cls, v: Any) -> Any:
+        """Intern the branch name."""
+        return _intern(v)
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "id": 1296269,
+            "name": "Hello-World",
+            "full_name": "octocat/Hello-World",
+            "owner": {"login": "octocat", "id": 1},
+            "description": "This your first repo!",
+            "html_url": "https://github.com/octocat/Hello-World",
+            "clone_url": "https://github.com/octocat/Hello-World.git",
+            "default_branch": "main",
+            "language": "Python",
+            "private": False
         }
+    })
 
 class RepositoryConfig(BaseModel):
     """Repository configuration for AI-CodeReview."""
     repository_id: int = Field(..., description="GitHub repository ID")
     full_name: str = Field(..., description="Repository full name")
-    status: RepositoryStatus = Field(default=RepositoryStatus.ACTIVE)
+    status: RepositoryStatusValue = Field(default=RepositoryStatus.ACTIVE.value)
     auto_analysis: bool = Field(default=True, description="Enable automatic PR analysis")
     webhook_url: Optional[str] = Field(None, description="Webhook endpoint URL")
     webhook_secret: Optional[str] = Field(None, description="Webhook secret for validation")
     analysis_config: Dict[str, Any] = Field(default_factory=dict, description="Custom analysis settings")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_now_utc)
+    updated_at: datetime = Field(default_factory=_now_utc)
+    
+    @field_validator('full_name', mode='before')
+    @classmethod
+    def _intern_names(cls, v: Any) -> Any:
+        """Intern the repository name."""
+        return _intern(v)
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "repository_id": 1296269,
-                "full_name": "octocat/Hello-World",
-                "status": "active",
-                "auto_analysis": True,
-                "webhook_url": "https://api.ai-codereview.com/webhook",
-                "analysis_config": {
-                    "skip_files": ["*.md", "*.txt"],
-                    "quality_threshold": 70
-                }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "repository_id": 1296269,
+            "full_name": "octocat/Hello-World",
+            "status": "active",
+            "auto_analysis": True,
+            "webhook_url": "https://api.ai-codereview.com/webhook",
+            "analysis_config": {
+                "skip_files": ["*.md", "*.txt"],
+                "quality_threshold": 70
             }
         }
+    })
 
-class PullRequestInfo(BaseModel):
+class PullRequestInfo(TrustedConstructMixin, BaseModel):
     """Pull request information from GitHub."""
     number: int = Field(..., description="PR number")
     title: str = Field(..., description="PR title")
     body: Optional[str] = Field(None, description="PR description")
-    state: PullRequestState = Field(..., description="PR state")
+    state: PullRequestStateValue = Field(..., description="PR state")
     author: GitHubUser = Field(..., description="PR author")
     head_branch: str = Field(..., description="Source branch")
     base_branch: str = Field(..., description="Target branch")
     head_sha: str = Field(..., description="Latest commit SHA")
-    html_url: HttpUrl = Field(..., description="PR URL")
+    html_url: str = Field(..., description="PR URL")
     created_at: datetime = Field(..., description="PR creation time")
     updated_at: datetime = Field(..., description="Last update time")
     mergeable: Optional[bool] = Field(None, description="Whether PR is mergeable")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "number": 1,
-                "title": "Add new feature",
-                "body": "This PR adds a new feature to the application",
-                "state": "open",
-                "author": {"login": "developer", "id": 123},
-                "head_branch": "feature/new-feature",
-                "base_branch": "main",
-                "head_sha": "abc123def456",
-                "html_url": "https://github.com/octocat/Hello-World/pull/1",
-                "mergeable": True
-            }
+    @field_validator('html_url')
+    @classmethod
+    def _check_urls(cls, v: str) -> str:
+        """Require HTTPS for GitHub-provided URLs."""
+        return _require_https(v)
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "number": 1,
+            "title": "Add new feature",
+            "body": "This PR adds a new feature to the application",
+            "state": "open",
+            "author": {"login": "developer", "id": 123},
+            "head_branch": "feature/new-feature",
+            "base_branch": "main",
+            "head_sha": "abc123def456",
+            "html_url": "https://github.com/octocat/Hello-World/pull/1",
+            "mergeable": True
         }
+    })
 
-class FileChange(BaseModel):
+class FileChange(TrustedConstructMixin, BaseModel):
     """Information about a changed file in a PR."""
     filename: str = Field(..., description="File path")
     status: str = Field(..., description="Change status (added, modified, removed)")
     additions: int = Field(..., ge=0, description="Lines added")
     deletions: int = Field(..., ge=0, description="Lines deleted")
-    changes: int = Field(..., ge=0, description="Total changes")
     patch: Optional[str] = Field(None, description="File diff patch")
     
-    @validator('changes')
-    def changes_equals_additions_plus_deletions(cls, v, values):
-        """Ensure changes equals additions plus deletions."""
-        if 'additions' in values and 'deletions' in values:
-            expected = values['additions'] + values['deletions']
-            if v != expected:
-                raise ValueError(f'Changes ({v}) must equal additions + deletions ({expected})')
-        return v
+    @computed_field(description="Total changes")
+    @property
+    def changes(self) -> int:
+        """Total changed lines, always additions plus deletions."""
+        return self.additions + self.deletions
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "filename": "src/main.py",
-                "status": "modified",
-                "additions": 10,
-                "deletions": 5,
-                "changes": 15,
-                "patch": "@@ -1,3 +1,4 @@\n def hello():\n+    print('Hello')\n     pass"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "filename": "src/main.py",
+            "status": "modified",
+            "additions": 10,
+            "deletions": 5,
+            "changes": 15,
+            "patch": "@@ -1,3 +1,4 @@\n def hello():\n+    print('Hello')\n     pass"
         }
+    })
 
-class PullRequestAnalysis(BaseModel):
+class PullRequestAnalysis(TrustedConstructMixin, BaseModel):
     """Analysis results for a pull request."""
     pr_number: int = Field(..., description="PR number")
     repository: str = Field(..., description="Repository full name")
@@ -181,31 +293,40 @@ class PullRequestAnalysis(BaseModel):
     average_quality_score: float = Field(..., ge=0.0, le=100.0, description="Average quality score")
     security_risk_level: str = Field(..., description="Overall security risk")
     recommendation: str = Field(..., description="Analysis recommendation")
-    analysis_timestamp: datetime = Field(default_factory=datetime.utcnow)
+    analysis_timestamp: datetime = Field(default_factory=_now_utc)
+    
+    # Read-only response model: frozen and hashable once built
+    model_config = ConfigDict(frozen=True, extra="ignore")
     
-    @validator('files_with_issues')
-    def files_with_issues_not_exceed_total(cls, v, values):
+    @field_validator('repository', mode='before')
+    @classmethod
+    def _intern_names(cls, v: Any) -> Any:
+        """Intern the repository name."""
+        return _intern(v)
+    
+    @field_validator('files_with_issues')
+    @classmethod
+    def files_with_issues_not_exceed_total(cls, v: int, info: ValidationInfo) -> int:
         """Ensure files with issues doesn't exceed total files."""
-        if 'total_files' in values and v > values['total_files']:
+        if 'total_files' in info.data and v > info.data['total_files']:
             raise ValueError('Files with issues cannot exceed total files')
         return v
 
-class WebhookPayload(BaseModel):
+class WebhookPayload(TrustedConstructMixin, BaseModel):
     """GitHub webhook payload structure."""
     action: str = Field(..., description="Webhook action")
     repository: Repository = Field(..., description="Repository information")
     sender: GitHubUser = Field(..., description="Event sender")
     pull_request: Optional[PullRequestInfo] = Field(None, description="PR info for PR events")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "action": "opened",
-                "repository": {"id": 1296269, "name": "Hello-World"},
-                "sender": {"login": "octocat", "id": 1},
-                "pull_request": {"number": 1, "title": "Add feature"}
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "action": "opened",
+            "repository": {"id": 1296269, "name": "Hello-World"},
+            "sender": {"login": "octocat", "id": 1},
+            "pull_request": {"number": 1, "title": "Add feature"}
         }
+    })
 
 class RepositoryStats(BaseModel):
     """Repository analysis statistics."""
@@ -216,17 +337,23 @@ class RepositoryStats(BaseModel):
     average_quality_score: float = Field(..., ge=0.0, le=100.0, description="Average quality score")
     last_analysis: Optional[datetime] = Field(None, description="Last analysis timestamp")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "repository": "octocat/Hello-World",
-                "total_prs_analyzed": 25,
-                "total_files_analyzed": 150,
-                "total_issues_found": 12,
-                "average_quality_score": 82.5,
-                "last_analysis": "2025-06-01T20:20:00Z"
-            }
+    @field_validator('repository', mode='before')
+    @classmethod
+    def _intern_names(cls, v: Any) -> Any:
+        """Intern the repository name."""
+        return _intern(v)
+    
+    # Read-only response model: frozen and hashable once built
+    model_config = ConfigDict(frozen=True, extra="ignore", json_schema_extra={
+        "example": {
+            "repository": "octocat/Hello-World",
+            "total_prs_analyzed": 25,
+            "total_files_analyzed": 150,
+            "total_issues_found": 12,
+            "average_quality_score": 82.5,
+            "last_analysis": "2025-06-01T20:20:00Z"
         }
+    })
 
 # Request/Response models for API endpoints
 class AddRepositoryRequest(BaseModel):
@@ -235,8 +362,9 @@ class AddRepositoryRequest(BaseModel):
     auto_analysis: bool = Field(default=True, description="Enable automatic analysis")
     webhook_secret: Optional[str] = Field(None, description="Webhook secret")
     
-    @validator('repository_url')
-    def validate_github_url(cls, v):
+    @field_validator('repository_url')
+    @classmethod
+    def validate_github_url(cls, v: HttpUrl) -> HttpUrl:
         """Ensure URL is a valid GitHub repository URL."""
         url_str = str(v)
         if not url_str.startswith('https://github.com/'):
@@ -248,36 +376,45 @@ class RepositoryListResponse(BaseModel):
     repositories: List[RepositoryConfig] = Field(..., description="List of configured repositories")
     total_count: int = Field(..., ge=0, description="Total number of repositories")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "repositories": [{"repository_id": 1296269, "full_name": "octocat/Hello-World"}],
-                "total_count": 1
-            }
+    # Not frozen: frozen models promise a hash, and the nested
+    # RepositoryConfig entries (which carry a dict) cannot provide one
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "repositories": [{"repository_id": 1296269, "full_name": "octocat/Hello-World"}],
+            "total_count": 1
         }
+    })
+
+# File extensions (lowercase, without the dot) worth sending to the analyzer
+ANALYZABLE_EXTENSIONS = frozenset({
+    'py', 'js', 'ts', 'java', 'cpp', 'cc', 'cxx', 'c', 'h',
+    'go', 'rs', 'php', 'rb', 'swift', 'kt', 'scala', 'cs'
+})
 
 # Utility functions for repository operations
 def extract_owner_repo(full_name: str) -> tuple[str, str]:
     """Extract owner and repository name from full_name."""
-    if '/' not in full_name:
+    owner, sep, repo = full_name.partition('/')
+    if not sep or not owner or not repo or '/' in repo:
         raise ValueError("Invalid repository format. Expected 'owner/repo'")
     
-    parts = full_name.split('/')
-    if len(parts) != 2:
-        raise ValueError("Invalid repository format. Expected 'owner/repo'")
-    
-    return parts[0], parts[1]
+    return owner, repo
 
+@lru_cache(maxsize=4096)
 def is_analyzable_file(filename: str) -> bool:
     """Check if a file should be analyzed based on its extension."""
-    analyzable_extensions = {
-        '.py', '.js', '.ts', '.java', '.cpp', '.cc', '.cxx', '.c', '.h',
-        '.go', '.rs', '.php', '.rb', '.swift', '.kt', '.scala', '.cs'
-    }
-    
-    # Get file extension
-    if '.' not in filename:
-        return False
+    _, sep, extension = filename.rpartition('.')
+    return bool(sep) and extension.lower() in ANALYZABLE_EXTENSIONS
+
+def _warmup() -> None:
+    """
+    Front-load per-class lookups so the first webhook doesn't pay for them.
     
-    extension = '.' + filename.split('.')[-1].lower()
-    return extension in analyzable_extensions
\ No newline at end of file
+    Pydantic builds each model's core schema when the class is defined;
+    what is still lazy is the nested-field map used by from_trusted().
+    """
+    for model in (GitHubUser, Repository, PullRequestInfo, FileChange,
+                  PullRequestAnalysis, WebhookPayload):
+        model._trusted_nested_fields()
+
+_warmup()
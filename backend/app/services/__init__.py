@@ -10,9 +10,44 @@ Main Services:
 - WebhookHandler: GitHub webhook event processing
 """
 
-from .code_analyzer import CodeAnalyzer, AIModelManager, CodeAnalysisResult
-from .github_integration import GitHubIntegration, PullRequestInfo
-from .webhook_handler import WebhookHandler, WebhookProcessor, WebhookEvent, WebhookEventType
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import logging
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from .code_analyzer import CodeAnalyzer, AIModelManager, CodeAnalysisResult
+    from .github_integration import GitHubIntegration, PullRequestInfo
+    from .webhook_handler import WebhookHandler, WebhookProcessor, WebhookEvent, WebhookEventType
+
+# Service classes are imported on first attribute access (PEP 562), so
+# importing the package doesn't pull in transformers or the HTTP clients
+_LAZY_IMPORTS = {
+    "CodeAnalyzer": ".code_analyzer",
+    "AIModelManager": ".code_analyzer",
+    "CodeAnalysisResult": ".code_analyzer",
+    "GitHubIntegration": ".github_integration",
+    "PullRequestInfo": ".github_integration",
+    "WebhookHandler": ".webhook_handler",
+    "WebhookProcessor": ".webhook_handler",
+    "WebhookEvent": ".webhook_handler",
+    "WebhookEventType": ".webhook_handler",
+}
+
+def __getattr__(name: str):
+    """Import a service class from its module on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    attr = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = attr
+    return attr
 
 # Export main service classes
 __all__ = [
@@ -43,9 +78,9 @@ AI_MODELS_CONFIG = {
         "max_length": 512,
     },
     "text_generation": {
-        "model": "microsoft/DialoGPT-medium",
+        "model": "distilgpt2",
         "description": "Generates code documentation", 
-        "max_length": 150,
+        "max_new_tokens": 60,
     },
     "question_answering": {
         "model": "deepset/roberta-base-squad2",
@@ -81,6 +116,9 @@ WEBHOOK_CONFIG = {
     "max_file_size": 1024 * 1024,  # 1MB
 }
 
+# Hashed view of the supported events for per-webhook membership checks
+_SUPPORTED_EVENTS = frozenset(WEBHOOK_CONFIG["supported_events"])
+
 # Analysis quality thresholds
 ANALYSIS_THRESHOLDS = {
     "quality_score": {
@@ -101,8 +139,14 @@ ANALYSIS_THRESHOLDS = {
     },
 }
 
+@lru_cache(maxsize=1)
 def get_service_info() -> dict:
-    """Get service information and configuration for debugging/monitoring."""
+    """
+    Get service information and configuration for debugging/monitoring.
+    
+    Everything in it is fixed at import, so it is built once and the same
+    dict is returned on every call; treat it as read-only.
+    """
     return {
         "version": SERVICES_VERSION,
         "available_services": list(__all__),
@@ -112,47 +156,53 @@ def get_service_info() -> dict:
         "analysis_thresholds": ANALYSIS_THRESHOLDS,
     }
 
+# Third-party packages the services cannot run without
+REQUIRED_DEPENDENCIES = ("transformers", "aiohttp")
+
 def validate_service_dependencies() -> bool:
-    """Check if all required dependencies are available."""
-    try:
-        import transformers
-        from transformers import pipeline
-        
-        # Basic validation - create test pipeline
-        test_pipeline = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-        return True
-        
-    except ImportError as e:
-        print(f"Missing dependency: {e}")
-        return False
-    except Exception as e:
-        print(f"Dependency validation failed: {e}")
+    """
+    Check if all required dependencies are available.
+    
+    Only probes that the packages can be found; nothing is imported or
+    loaded, so this is cheap enough to run on every health check.
+    """
+    missing = [name for name in REQUIRED_DEPENDENCIES if importlib.util.find_spec(name) is None]
+    if missing:
+        logger.warning("Missing dependency: %s", ", ".join(missing))
         return False
+    return True
 
 class ServiceManager:
-    """Manages service lifecycle and dependencies with lazy loading."""
+    """
+    Manages service lifecycle and dependencies with lazy loading.
+    
+    Each service is a cached_property: built on first access, then stored
+    on the instance so later reads are plain attribute lookups.
+    """
+    
+    # Services reported by health_check once they have been created
+    SERVICE_NAMES = ("code_analyzer", "github_client", "webhook_handler")
     
     def __init__(self, settings):
         self.settings = settings
-        self._services = {}
-        
-    def get_code_analyzer(self) -> CodeAnalyzer:
-        """Get or create CodeAnalyzer instance (lazy loaded)."""
-        if "code_analyzer" not in self._services:
-            self._services["code_analyzer"] = CodeAnalyzer()
-        return self._services["code_analyzer"]
     
-    def get_github_client(self) -> GitHubIntegration:
-        """Get or create GitHubIntegration instance."""
-        if "github_client" not in self._services:
-            self._services["github_client"] = GitHubIntegration(self.settings.github_token)
-        return self._services["github_client"]
+    @cached_property
+    def code_analyzer(self) -> CodeAnalyzer:
+        """CodeAnalyzer instance (lazy loaded)."""
+        from .code_analyzer import get_shared_code_analyzer
+        return get_shared_code_analyzer()
+    
+    @cached_property
+    def github_client(self) -> GitHubIntegration:
+        """GitHubIntegration instance."""
+        from .github_integration import get_shared_github_client
+        return get_shared_github_client(self.settings.github_token, self.settings.github_max_retries)
     
-    def get_webhook_handler(self) -> WebhookHandler:
-        """Get or create WebhookHandler instance."""
-        if "webhook_handler" not in self._services:
-            self._services["webhook_handler"] = WebhookHandler(self.settings)
-        return self._services["webhook_handler"]
+    @cached_property
+    def webhook_handler(self) -> WebhookHandler:
+        """WebhookHandler instance."""
+        from .webhook_handler import WebhookHandler
+        return WebhookHandler(self.settings)
     
     def health_check(self) -> dict:
         """Perform health checks on all services."""
@@ -161,8 +211,11 @@ class ServiceManager:
             "services": {},
         }
         
-        # Check each initialized service
-        for service_name, service_instance in self._services.items():
+        # Check each initialized service (cached_property stores it in __dict__)
+        for service_name in self.SERVICE_NAMES:
+            if service_name not in self.__dict__:
+                continue
+            service_instance = self.__dict__[service_name]
             try:
                 if hasattr(service_instance, '__class__'):
                     health_status["services"][service_name] = "healthy"
@@ -11,13 +11,130 @@ This acts as the "messenger" that talks to GitHub on behalf of the system.
 
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Any
+import hmac
+import orjson
+import random
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
+from urllib.parse import urlencode
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 import base64
 
 logger = logging.getLogger(__name__)
 
+# Maximum simultaneous connections held open to the GitHub API; one
+# client is shared by the whole process
+GITHUB_CONNECTION_LIMIT = 100
+
+# Concurrent file downloads per call, kept under GitHub's abuse-detection limits
+GITHUB_FETCH_CONCURRENCY = 10
+
+# Largest page size the REST API allows for list endpoints
+GITHUB_PAGE_SIZE = 100
+
+# Media type asking the contents API for the file body itself
+RAW_CONTENT_HEADERS = {"Accept": "application/vnd.github.raw"}
+
+# Maximum number of GET responses kept for ETag revalidation
+ETAG_CACHE_SIZE = 2048
+
+# Raw file bodies longer than this (characters) are not kept for revalidation
+ETAG_CACHE_MAX_TEXT = 256 * 1024
+
+# Outbound request budget, kept under GitHub's secondary (burst) limits
+GITHUB_REQUESTS_PER_MINUTE = 80
+
+# When fewer primary rate-limit requests than this remain, wait for the reset
+GITHUB_RATE_LIMIT_RESERVE = 20
+
+# Retries for rate-limited (403/429) responses, and the longest single wait
+GITHUB_MAX_RETRIES = 3
+GITHUB_MAX_BACKOFF = 60.0
+
+# Unified diff hunk header; group 1 is the first line of the new side,
+# group 2 its line count
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+def extract_added_lines(patch: str) -> str:
+    """
+    Pull the added lines out of a unified diff.
+    
+    Reviews only need the code a pull request introduces, so the analyzer
+    is given these lines instead of the whole file.
+    
+    Args:
+        patch: Unified diff as returned in a PR file's "patch" field
+        
+    Returns:
+        The added lines without their leading "+", joined by newlines
+    """
+    return "\n".join(
+        line[1:] for line in patch.splitlines()
+        if line.startswith("+") and not line.startswith("+++")
+    )
+
+def first_changed_line(patch: str) -> Optional[int]:
+    """
+    Find a line of the new file that a review comment can be attached to.
+    
+    Review comments must point at a line inside the diff, so this returns
+    the first new-side line of the first hunk.
+    
+    Args:
+        patch: Unified diff as returned in a PR file's "patch" field
+        
+    Returns:
+        Line number in the new file, or None if the patch has no new-side lines
+    """
+    match = _HUNK_HEADER.match(patch)
+    if not match or match.group(2) == "0":
+        return None
+    return int(match.group(1))
+
+def _header_number(headers: Any, name: str) -> Optional[float]:
+    """Read a numeric response header, or None if absent or malformed."""
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """
+    Token bucket shared by every request a client makes.
+    
+    Holds up to `rate` tokens and refills at rate/period per second. Each
+    acquire() reserves a token immediately and sleeps if the bucket had run
+    dry, so callers are served in arrival order without a lock.
+    """
+    
+    def __init__(self, rate: int, period: float):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Requests allowed per period (also the burst size)
+            period: Length of the period in seconds
+        """
+        self.capacity = float(rate)
+        self.fill_rate = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        """Take one token, waiting for the bucket to refill if necessary."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+        self._updated = now
+        
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.fill_rate)
+
 @dataclass
 class PullRequestInfo:
     """Information about a GitHub pull request that needs to be analyzed."""
@@ -37,50 +154,228 @@ class GitHubIntegration:
     of fetching code and posting results.
     """
     
-    def __init__(self, github_token: str):
+    def __init__(self, github_token: Union[str, Any], max_retries: int = GITHUB_MAX_RETRIES):
         """
         Initialize GitHub integration with authentication.
         
         Args:
-            github_token: Personal access token for GitHub API
+            github_token: Personal access token for GitHub API (str or SecretStr)
+            max_retries: Retries for responses rejected by rate limiting
         """
+        # Settings hold the token as a SecretStr, whose str() is masked;
+        # sending that would make every call unauthenticated (60/hour)
+        if hasattr(github_token, "get_secret_value"):
+            github_token = github_token.get_secret_value()
+        
         self.github_token = github_token
+        self.max_retries = max_retries
         self.base_url = "https://api.github.com"
         self.headers = {
             "Authorization": f"token {github_token}",
             "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "AI-CodeReview/1.0"
+            "User-Agent": "AI-CodeReview/1.0",
+            "Accept-Encoding": "gzip"
         }
         
+        # One connection pool for every call; created on first use because
+        # aiohttp sessions must be built inside a running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # LRU of request key -> (ETag, parsed body, pagination links) so
+        # repeat GETs can be answered by a 304 Not Modified
+        self._etags: "OrderedDict[str, Tuple[str, Any, Any]]" = OrderedDict()
+        
+        # Client-side pacing, plus the epoch time until which the primary
+        # rate limit is nearly spent and requests should hold off
+        self._bucket = TokenBucket(GITHUB_REQUESTS_PER_MINUTE, 60.0)
+        self._rate_limit_reset = 0.0
+        
         logger.info("GitHub integration initialized")
     
-    async def fetch_pull_request_files(self, repo_owner: str, repo_name: str, pr_number: int) -> List[Dict[str, Any]]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it if needed.
+        
+        Reusing one session keeps TCP and TLS connections to GitHub alive
+        between calls instead of handshaking for every request.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit=GITHUB_CONNECTION_LIMIT,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                )
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session. Call once on application shutdown."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        logger.info("GitHub integration session closed")
+    
+    @asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Send a request through the rate limiter, retrying rate-limit rejections.
+        
+        Every call takes a token from the client's bucket and waits out a
+        nearly exhausted primary rate limit. A 429, or a 403 that GitHub
+        marks as rate limiting (Retry-After or no requests remaining), is
+        retried up to max_retries times after Retry-After, the reset time
+        or an exponential backoff with jitter, as long as the wait is under
+        GITHUB_MAX_BACKOFF. Any other response is yielded to the caller.
+        
+        Args:
+            method: HTTP method ("GET" or "POST")
+            url: Endpoint URL
+            **kwargs: Passed through to the session request
+        """
+        session = await self._get_session()
+        send = getattr(session, method.lower())
+        
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            wait = self._rate_limit_reset - time.time()
+            if wait > 0:
+                logger.warning(f"GitHub rate limit nearly exhausted, waiting {wait:.0f}s")
+                await asyncio.sleep(wait)
+            
+            async with send(url, **kwargs) as response:
+                delay = self._check_rate_limit(response, attempt)
+                if delay is None:
+                    yield response
+                    return
+            
+            logger.warning(f"GitHub rate limited ({response.status}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    def _check_rate_limit(self, response: aiohttp.ClientResponse, attempt: int) -> Optional[float]:
+        """
+        Record rate-limit headers and decide whether to retry a response.
+        
+        Args:
+            response: Response just received
+            attempt: Zero-based attempt number
+            
+        Returns:
+            Seconds to wait before retrying, or None to accept the response
+        """
+        remaining = _header_number(response.headers, "X-RateLimit-Remaining")
+        reset = _header_number(response.headers, "X-RateLimit-Reset")
+        if remaining is not None and reset is not None and remaining < GITHUB_RATE_LIMIT_RESERVE:
+            self._rate_limit_reset = max(self._rate_limit_reset, reset)
+        
+        if response.status not in (403, 429) or attempt >= self.max_retries:
+            return None
+        
+        retry_after = _header_number(response.headers, "Retry-After")
+        if retry_after is not None:
+            delay = retry_after
+        elif remaining == 0 and reset is not None:
+            delay = reset - time.time()
+        elif response.status == 429:
+            delay = 2 ** attempt + random.uniform(0, 1)
+        else:
+            # A plain 403 is a permissions error, not rate limiting
+            return None
+        
+        return delay if delay <= GITHUB_MAX_BACKOFF else None
+    
+    async def _conditional_get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                               raw: bool = False) -> Tuple[int, Any, Any]:
+        """
+        GET a resource, revalidating cached copies with ETags.
+        
+        GitHub answers a matching If-None-Match with 304 Not Modified, which
+        has no body and does not count against the rate limit. The cached
+        body is returned instead and reported as status 200. Raw file bodies
+        above ETAG_CACHE_MAX_TEXT are not cached.
+        
+        Args:
+            url: Endpoint URL
+            params: Optional query parameters
+            raw: Request the raw media type and return the body as text
+                instead of parsed JSON
+            
+        Returns:
+            Tuple of (status, body or None, response pagination links)
+        """
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        if raw:
+            cache_key = f"raw:{cache_key}"
+        cached = self._etags.get(cache_key)
+        
+        headers = dict(RAW_CONTENT_HEADERS) if raw else {}
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        
+        async with self._request("GET", url, params=params, headers=headers or None) as response:
+            if response.status == 304 and cached:
+                self._etags.move_to_end(cache_key)
+                return 200, cached[1], cached[2]
+            if response.status != 200:
+                return response.status, None, None
+            
+            if raw:
+                data = await response.text(encoding="utf-8")
+            else:
+                data = await response.json(loads=orjson.loads)
+            
+            etag = response.headers.get("ETag")
+            if etag and not (raw and len(data) > ETAG_CACHE_MAX_TEXT):
+                self._etags[cache_key] = (etag, data, response.links)
+                self._etags.move_to_end(cache_key)
+                if len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+            return 200, data, response.links
+    
+    async def fetch_pull_request_files(self, repo_owner: str, repo_name: str, pr_number: int,
+                                       paginate: bool = True) -> List[Dict[str, Any]]:
         """
         Get all files changed in a pull request.
         
         Asks GitHub: "What files were modified in this pull request?"
+        Each entry carries a unified diff in its "patch" field (omitted by
+        GitHub for binary or very large diffs), which is usually all the
+        analysis needs.
         
         Args:
             repo_owner: GitHub username or organization
             repo_name: Repository name
             pr_number: Pull request number
+            paginate: Follow the Link header to collect every page of files
             
         Returns:
             List of file information including content and changes
         """
         url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/files"
+        params = {"per_page": GITHUB_PAGE_SIZE}
+        files_data: List[Dict[str, Any]] = []
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        files_data = await response.json()
-                        logger.info(f"Fetched {len(files_data)} files from PR #{pr_number}")
-                        return files_data
-                    else:
-                        logger.error(f"Failed to fetch PR files: {response.status}")
-                        return []
-                        
+            while url:
+                status, page, links = await self._conditional_get(url, params)
+                if status != 200:
+                    logger.error(f"Failed to fetch PR files: {status}")
+                    return []
+                
+                files_data.extend(page)
+                
+                # A short page is the last one; otherwise follow rel="next",
+                # whose URL already carries the query parameters
+                next_link = None
+                if paginate and len(page) == GITHUB_PAGE_SIZE:
+                    next_link = links.get("next")
+                url = str(next_link["url"]) if next_link else None
+                params = None
+            
+            logger.info(f"Fetched {len(files_data)} files from PR #{pr_number}")
+            return files_data
+                    
         except Exception as e:
             logger.error(f"Error fetching PR files: {e}")
             return []
@@ -90,6 +385,8 @@ class GitHubIntegration:
         Download the actual content of a file from GitHub.
         
         Asks GitHub: "Can you send me the contents of this specific file?"
+        The raw media type is tried first; the base64 JSON form is only
+        used if that request fails for a reason other than a missing file.
         
         Args:
             repo_owner: GitHub username or organization
@@ -104,27 +401,61 @@ class GitHubIntegration:
         params = {"ref": ref}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, params=params) as response:
-                    if response.status == 200:
-                        file_data = await response.json()
-                        
-                        # GitHub returns file content encoded in base64
-                        if file_data.get("encoding") == "base64":
-                            content = base64.b64decode(file_data["content"]).decode('utf-8')
-                            logger.info(f"Successfully fetched content for {file_path}")
-                            return content
-                        else:
-                            logger.warning(f"Unexpected encoding for {file_path}")
-                            return None
+            # Raw content skips the JSON envelope and the base64 round trip
+            status, content, _ = await self._conditional_get(url, params, raw=True)
+            if status == 200:
+                logger.info(f"Successfully fetched content for {file_path}")
+                return content
+            elif status == 404:
+                logger.error(f"Failed to fetch file content: {status}")
+                return None
+            
+            async with self._request("GET", url, params=params) as response:
+                if response.status == 200:
+                    file_data = await response.json(loads=orjson.loads)
+                    
+                    # GitHub returns file content encoded in base64
+                    if file_data.get("encoding") == "base64":
+                        content = base64.b64decode(file_data["content"]).decode('utf-8')
+                        logger.info(f"Successfully fetched content for {file_path}")
+                        return content
                     else:
-                        logger.error(f"Failed to fetch file content: {response.status}")
+                        logger.warning(f"Unexpected encoding for {file_path}")
                         return None
-                        
+                else:
+                    logger.error(f"Failed to fetch file content: {response.status}")
+                    return None
+                    
         except Exception as e:
             logger.error(f"Error fetching file content: {e}")
             return None
     
+    async def get_files_content(self, repo_owner: str, repo_name: str, file_paths: List[str],
+                                ref: str = "main") -> Dict[str, Optional[str]]:
+        """
+        Download several files from GitHub at once.
+        
+        Requests run concurrently over the shared session, with at most
+        GITHUB_FETCH_CONCURRENCY in flight, so a whole pull request costs
+        about as much wall-clock time as its slowest file.
+        
+        Args:
+            repo_owner: GitHub username or organization
+            repo_name: Repository name
+            file_paths: Paths to the files in the repository
+            ref: Branch or commit reference
+            
+        Returns:
+            Mapping of file path to content, with None for files that failed
+        """
+        semaphore = asyncio.Semaphore(GITHUB_FETCH_CONCURRENCY)
+        
+        async def fetch(file_path: str):
+            async with semaphore:
+                return file_path, await self.get_file_content(repo_owner, repo_name, file_path, ref)
+        
+        return dict(await asyncio.gather(*(fetch(file_path) for file_path in file_paths)))
+    
     async def post_review_comment(self, repo_owner: str, repo_name: str, pr_number: int, 
                                  comment_body: str, file_path: str = None, line_number: int = None) -> bool:
         """
@@ -161,19 +492,58 @@ class GitHubIntegration:
             data = {"body": comment_body}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=self.headers, json=data) as response:
-                    if response.status in [200, 201]:
-                        logger.info(f"Successfully posted comment to PR #{pr_number}")
-                        return True
-                    else:
-                        logger.error(f"Failed to post comment: {response.status}")
-                        return False
-                        
+            async with self._request("POST", url, json=data) as response:
+                if response.status in [200, 201]:
+                    logger.info(f"Successfully posted comment to PR #{pr_number}")
+                    return True
+                else:
+                    logger.error(f"Failed to post comment: {response.status}")
+                    return False
+                    
         except Exception as e:
             logger.error(f"Error posting comment: {e}")
             return False
     
+    async def submit_review(self, repo_owner: str, repo_name: str, pr_number: int, body: str,
+                            comments: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Submit a pull request review carrying any number of file comments.
+        
+        One review replaces a separate POST per comment, so a large pull
+        request costs a single API call instead of one per finding.
+        
+        Args:
+            repo_owner: GitHub username or organization
+            repo_name: Repository name
+            pr_number: Pull request number
+            body: Top-level review text
+            comments: Draft review comments, each with "path", "line" and "body"
+            
+        Returns:
+            True if the review was submitted successfully, False otherwise
+        """
+        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/reviews"
+        data = {
+            "body": body,
+            "event": "COMMENT",
+            "comments": comments or []
+        }
+        
+        try:
+            async with self._request("POST", url, json=data) as response:
+                if response.status in [200, 201]:
+                    logger.info(
+                        f"Submitted review with {len(data['comments'])} comments to PR #{pr_number}"
+                    )
+                    return True
+                else:
+                    logger.error(f"Failed to submit review: {response.status}")
+                    return False
+                    
+        except Exception as e:
+            logger.error(f"Error submitting review: {e}")
+            return False
+    
     async def get_pull_request_info(self, repo_owner: str, repo_name: str, pr_number: int) -> Optional[PullRequestInfo]:
         """
         Get basic information about a pull request.
@@ -183,27 +553,24 @@ class GitHubIntegration:
         url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        pr_data = await response.json()
-                        
-                        # Extract the information needed
-                        pr_info = PullRequestInfo(
-                            number=pr_data["number"],
-                            title=pr_data["title"],
-                            author=pr_data["user"]["login"],
-                            branch=pr_data["head"]["ref"],
-                            changed_files=[],  # Will be filled separately
-                            repository=f"{repo_owner}/{repo_name}"
-                        )
-                        
-                        logger.info(f"Fetched PR info for #{pr_number}: {pr_info.title}")
-                        return pr_info
-                    else:
-                        logger.error(f"Failed to fetch PR info: {response.status}")
-                        return None
-                        
+            status, pr_data, _ = await self._conditional_get(url)
+            if status == 200:
+                # Extract the information needed
+                pr_info = PullRequestInfo(
+                    number=pr_data["number"],
+                    title=pr_data["title"],
+                    author=pr_data["user"]["login"],
+                    branch=pr_data["head"]["ref"],
+                    changed_files=[],  # Will be filled separately
+                    repository=f"{repo_owner}/{repo_name}"
+                )
+                
+                logger.info(f"Fetched PR info for #{pr_number}: {pr_info.title}")
+                return pr_info
+            else:
+                logger.error(f"Failed to fetch PR info: {status}")
+                return None
+                
         except Exception as e:
             logger.error(f"Error fetching PR info: {e}")
             return None
@@ -222,16 +589,14 @@ class GitHubIntegration:
         url = f"{self.base_url}/repos/{repo_owner}/{repo_name}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        repo_data = await response.json()
-                        logger.info(f"Fetched repository info for {repo_owner}/{repo_name}")
-                        return repo_data
-                    else:
-                        logger.error(f"Failed to fetch repository info: {response.status}")
-                        return None
-                        
+            status, repo_data, _ = await self._conditional_get(url)
+            if status == 200:
+                logger.info(f"Fetched repository info for {repo_owner}/{repo_name}")
+                return repo_data
+            else:
+                logger.error(f"Failed to fetch repository info: {status}")
+                return None
+                
         except Exception as e:
             logger.error(f"Error fetching repository info: {e}")
             return None
@@ -271,23 +636,64 @@ class GitHubIntegration:
             data["conclusion"] = conclusion
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=self.headers, json=data) as response:
-                    if response.status in [200, 201]:
-                        logger.info(f"Successfully created check run for commit {commit_sha}")
-                        return True
-                    else:
-                        logger.error(f"Failed to create check run: {response.status}")
-                        return False
-                        
+            async with self._request("POST", url, json=data) as response:
+                if response.status in [200, 201]:
+                    logger.info(f"Successfully created check run for commit {commit_sha}")
+                    return True
+                else:
+                    logger.error(f"Failed to create check run: {response.status}")
+                    return False
+                    
         except Exception as e:
             logger.error(f"Error creating check run: {e}")
             return False
     
+    async def iter_pull_requests(self, repo_owner: str, repo_name: str,
+                                 state: str = "open") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the pull requests in a repository one at a time.
+        
+        Pages of GITHUB_PAGE_SIZE are fetched lazily by following the Link
+        header, so only one page is held in memory and callers that stop
+        early never request the rest.
+        
+        Args:
+            repo_owner: GitHub username or organization
+            repo_name: Repository name
+            state: "open", "closed", or "all"
+            
+        Yields:
+            Pull request data
+        """
+        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls"
+        params = {"state": state, "per_page": GITHUB_PAGE_SIZE}
+        
+        while url:
+            try:
+                status, page, links = await self._conditional_get(url, params)
+            except Exception as e:
+                logger.error(f"Error fetching pull requests: {e}")
+                return
+            
+            if status != 200:
+                logger.error(f"Failed to fetch pull requests: {status}")
+                return
+            
+            for pr_data in page:
+                yield pr_data
+            
+            # A short page is the last one; the next URL carries the params
+            next_link = links.get("next") if len(page) == GITHUB_PAGE_SIZE else None
+            url = str(next_link["url"]) if next_link else None
+            params = None
+    
     async def list_pull_requests(self, repo_owner: str, repo_name: str, state: str = "open") -> List[Dict[str, Any]]:
         """
         List pull requests in a repository.
         
+        Collects every page from iter_pull_requests; prefer iterating when
+        the repository may have many pull requests.
+        
         Args:
             repo_owner: GitHub username or organization
             repo_name: Repository name
@@ -296,23 +702,9 @@ class GitHubIntegration:
         Returns:
             List of pull request data
         """
-        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls"
-        params = {"state": state}
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, params=params) as response:
-                    if response.status == 200:
-                        prs_data = await response.json()
-                        logger.info(f"Fetched {len(prs_data)} pull requests from {repo_owner}/{repo_name}")
-                        return prs_data
-                    else:
-                        logger.error(f"Failed to fetch pull requests: {response.status}")
-                        return []
-                        
-        except Exception as e:
-            logger.error(f"Error fetching pull requests: {e}")
-            return []
+        prs_data = [pr async for pr in self.iter_pull_requests(repo_owner, repo_name, state)]
+        logger.info(f"Fetched {len(prs_data)} pull requests from {repo_owner}/{repo_name}")
+        return prs_data
     
     async def get_commit_info(self, repo_owner: str, repo_name: str, commit_sha: str) -> Optional[Dict[str, Any]]:
         """
@@ -329,16 +721,14 @@ class GitHubIntegration:
         url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/commits/{commit_sha}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        commit_data = await response.json()
-                        logger.info(f"Fetched commit info for {commit_sha}")
-                        return commit_data
-                    else:
-                        logger.error(f"Failed to fetch commit info: {response.status}")
-                        return None
-                        
+            status, commit_data, _ = await self._conditional_get(url)
+            if status == 200:
+                logger.info(f"Fetched commit info for {commit_sha}")
+                return commit_data
+            else:
+                logger.error(f"Failed to fetch commit info: {status}")
+                return None
+                
         except Exception as e:
             logger.error(f"Error fetching commit info: {e}")
             return None
@@ -355,26 +745,42 @@ class GitHubIntegration:
         Returns:
             True if signature is valid, False otherwise
         """
-        import hmac
-        import hashlib
-        
         if not secret:
             logger.warning("No webhook secret configured")
             return True  # Skip validation if no secret is set
         
         try:
-            expected_signature = hmac.new(
-                secret.encode('utf-8'),
-                payload,
-                hashlib.sha256
-            ).hexdigest()
-            
-            # GitHub sends signature as "sha256=<hash>"
+            # GitHub sends signature as "sha256=<hash>"; compare raw digests
+            # so the expected value never needs hex encoding
             if signature.startswith('sha256='):
                 signature = signature[7:]
             
-            return hmac.compare_digest(expected_signature, signature)
+            try:
+                signature_bytes = bytes.fromhex(signature)
+            except ValueError:
+                return False
+            
+            expected_signature = hmac.digest(secret.encode('utf-8'), payload, 'sha256')
+            return hmac.compare_digest(expected_signature, signature_bytes)
             
         except Exception as e:
             logger.error(f"Error validating webhook signature: {e}")
-            return False
\ No newline at end of file
+            return False
+
+@lru_cache(maxsize=4)
+def get_shared_github_client(github_token, max_retries: int = GITHUB_MAX_RETRIES) -> GitHubIntegration:
+    """
+    Return the process-wide GitHub client for a token.
+    
+    API routes, the service manager and the webhook processor all share one
+    instance, and so one connection pool, one ETag cache and one rate
+    limiter.
+    
+    Args:
+        github_token: Personal access token for GitHub API
+        max_retries: Retries for responses rejected by rate limiting
+        
+    Returns:
+        The shared GitHubIntegration for this token
+    """
+    return GitHubIntegration(github_token, max_retries)
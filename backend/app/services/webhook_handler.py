@@ -10,19 +10,66 @@ background tasks for code analysis while providing immediate responses to GitHub
 """
 
 import asyncio
-import json
+import hmac
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from dataclasses import dataclass
+import orjson
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Hashable, Set, Tuple, Union
+from datetime import datetime, timezone
+from dataclasses import dataclass, asdict
 from enum import Enum
+from uuid import uuid4
+
+from fastapi import HTTPException, status
 
 from ..utils.config import Settings
-from .code_analyzer import CodeAnalyzer
-from .github_integration import GitHubIntegration
+from ..database.connection import get_session_factory
+from ..database.schemas import bulk_create_analysis_records
+from . import _SUPPORTED_EVENTS
+from .code_analyzer import get_shared_code_analyzer
+from .github_integration import extract_added_lines, first_changed_line, get_shared_github_client
 
 logger = logging.getLogger(__name__)
 
+# Pull request info and file lists remembered per head commit, so repeated
+# events for the same revision skip the GitHub round-trips
+PR_DATA_CACHE_SIZE = 1024
+PR_DATA_CACHE_TTL = 60.0
+
+# Pull request analyses that may wait for a worker; beyond this, new pull
+# request webhooks are refused until the backlog drains
+ANALYSIS_QUEUE_SIZE = 100
+
+# Marker shown next to a security issue in file comments, by severity
+_SEVERITY_EMOJI = {'HIGH': "🔴"}
+
+# Source file extensions the analyzer understands
+_ANALYZABLE_EXTS = frozenset({
+    'py', 'js', 'ts', 'java', 'cpp', 'cc', 'cxx', 'c', 'h',
+    'go', 'rs', 'php', 'rb', 'swift', 'kt', 'scala', 'cs'
+})
+
+# Fire-and-forget tasks, referenced until done so they are not garbage
+# collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+def _spawn(coro: Awaitable[Any]) -> asyncio.Task:
+    """
+    Run a coroutine in the background without awaiting it.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The scheduled task
+    """
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 class WebhookEventType(Enum):
     """
     Supported GitHub webhook event types.
@@ -49,13 +96,26 @@ class PullRequestAction(Enum):
     READY_FOR_REVIEW = "ready_for_review"
     REOPENED = "reopened"
 
-@dataclass
+# Built once rather than per event
+_PR_ACTIONS = frozenset(action.value for action in PullRequestAction)
+
+# GitHub event names mapped to the enum
+_EVENT_TYPE_MAP = {
+    "pull_request": WebhookEventType.PULL_REQUEST,
+    "push": WebhookEventType.PUSH,
+    "pull_request_review": WebhookEventType.PULL_REQUEST_REVIEW,
+    "check_run": WebhookEventType.CHECK_RUN,
+}
+
+@dataclass(slots=True)
 class WebhookEvent:
     """
     Represents a processed webhook event with relevant information extracted.
     
     This makes it easier to work with webhook data by pulling out just
-    the fields we need and providing a clean interface.
+    the fields we need and providing a clean interface. The full payload
+    is not kept by default, since events can outlive their request for
+    as long as the analysis runs.
     """
     event_type: WebhookEventType
     repository_owner: str
@@ -63,7 +123,9 @@ class WebhookEvent:
     repository_full_name: str
     sender: str
     timestamp: datetime
-    raw_payload: Dict[str, Any]
+    
+    # zlib-compressed JSON of the payload, only with settings.retain_raw_payload
+    raw_payload: Optional[bytes] = None
     
     # Pull request specific fields
     pr_number: Optional[int] = None
@@ -72,6 +134,7 @@ class WebhookEvent:
     pr_author: Optional[str] = None
     pr_branch: Optional[str] = None
     pr_base_branch: Optional[str] = None
+    pr_head_sha: Optional[str] = None
     
     # Push specific fields
     ref: Optional[str] = None
@@ -79,6 +142,74 @@ class WebhookEvent:
     after_sha: Optional[str] = None
     commits: Optional[List[Dict[str, Any]]] = None
 
+class DedupWorkQueue:
+    """
+    Per-key work queue that only processes the latest item for each key.
+    
+    add() records the newest item for a key and starts a worker for that key
+    if none is running. The worker waits out a short coalescing window, takes
+    whatever item is latest, runs the handler, and repeats while newer items
+    arrived in the meantime - waiting at least min_interval between runs. A
+    burst of events for one key therefore collapses into a single run on the
+    final item (plus any run already in progress).
+    """
+    
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        coalesce_window: float = 0.25,
+        min_interval: float = 0.0
+    ):
+        """
+        Initialize the queue.
+        
+        Args:
+            handler: Coroutine function that processes one item
+            coalesce_window: Seconds to wait for newer items before running
+            min_interval: Minimum seconds between runs for the same key
+        """
+        self.handler = handler
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self._pending: Dict[Hashable, Any] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+    
+    async def add(self, key: Hashable, item: Any) -> None:
+        """
+        Queue an item, replacing any not-yet-processed item for the same key.
+        
+        Args:
+            key: Identity of the work (items with equal keys coalesce)
+            item: Latest input for the handler
+        """
+        if key in self._pending:
+            logger.info("Coalescing pending work for %s", key)
+        self._pending[key] = item
+        
+        if key not in self._workers:
+            self._workers[key] = asyncio.get_running_loop().create_task(self._work(key))
+    
+    async def _work(self, key: Hashable) -> None:
+        """Process the latest item for one key until none are pending."""
+        loop = asyncio.get_running_loop()
+        last_run: Optional[float] = None
+        
+        try:
+            while key in self._pending:
+                delay = self.coalesce_window
+                if last_run is not None:
+                    delay = max(delay, last_run + self.min_interval - loop.time())
+                await asyncio.sleep(delay)
+                
+                item = self._pending.pop(key)
+                last_run = loop.time()
+                try:
+                    await self.handler(item)
+                except Exception as e:
+                    logger.error("Error processing queued work for %s: %s", key, e)
+        finally:
+            self._workers.pop(key, None)
+
 class WebhookProcessor:
     """
     Processes different types of webhook events.
@@ -95,9 +226,27 @@ class WebhookProcessor:
             settings: Application configuration settings
         """
         self.settings = settings
-        self.code_analyzer = CodeAnalyzer()
-        self.github_client = GitHubIntegration(settings.github_token)
-        self.processing_queue = asyncio.Queue()
+        self.code_analyzer = get_shared_code_analyzer()
+        self.github_client = get_shared_github_client(settings.github_token, settings.github_max_retries)
+        
+        # Bounded FIFO of (event, completion future) served by a fixed pool
+        # of max_concurrent_analyses workers, so analyses run in arrival
+        # order across repositories and memory use stays capped
+        self.processing_queue: "asyncio.Queue[Tuple[WebhookEvent, asyncio.Future]]" = asyncio.Queue(
+            maxsize=ANALYSIS_QUEUE_SIZE
+        )
+        self._workers: List[asyncio.Task] = []
+        
+        # (owner, repo, pr_number, head_sha) -> (fetched_at, pr_info, changed_files)
+        self._pr_data_cache: "OrderedDict[Tuple[str, str, int, str], Tuple[float, Any, List]]" = OrderedDict()
+        
+        # Bursts of events for one pull request collapse into a single
+        # analysis of its latest revision
+        self._dedup_queue = DedupWorkQueue(
+            self._queue_pull_request_analysis,
+            coalesce_window=settings.webhook_coalesce_window_ms / 1000,
+            min_interval=settings.pr_analysis_min_interval
+        )
         
         logger.info("Webhook processor initialized")
     
@@ -119,36 +268,83 @@ class WebhookProcessor:
             return False
         
         # Check if this is an action we care about
-        if event.pr_action not in [action.value for action in PullRequestAction]:
-            logger.info(f"Ignoring PR action: {event.pr_action}")
+        if event.pr_action not in _PR_ACTIONS:
+            logger.info("Ignoring PR action: %s", event.pr_action)
             return True
         
         logger.info(
-            f"Processing PR #{event.pr_number} in {event.repository_full_name} "
-            f"(action: {event.pr_action})"
+            "Processing PR #%s in %s (action: %s)",
+            event.pr_number, event.repository_full_name, event.pr_action
         )
         
+        # Fetching and analysis happen once per burst, on the latest event
+        key: Tuple[str, str, int] = (event.repository_owner, event.repository_name, event.pr_number)
+        await self._dedup_queue.add(key, event)
+        return True
+    
+    def is_accepting(self) -> bool:
+        """Return False while the analysis queue is full."""
+        return not self.processing_queue.full()
+    
+    async def _queue_pull_request_analysis(self, event: WebhookEvent) -> None:
+        """
+        Hand the latest event for a pull request to the worker pool.
+        
+        Called by the dedup queue. Accepted work is never dropped: if the
+        queue is momentarily full this waits for a free slot, then waits
+        until a worker has finished the analysis, so newer events for the
+        pull request keep coalescing in the meantime.
+        
+        Args:
+            event: The webhook event to process
+        """
+        self._start_workers()
+        
+        done = asyncio.get_running_loop().create_future()
+        await self.processing_queue.put((event, done))
+        await done
+    
+    def _start_workers(self) -> None:
+        """Start the analysis workers on first use (they need a running loop)."""
+        if not self._workers:
+            self._workers = [
+                _spawn(self._analysis_worker())
+                for _ in range(self.settings.max_concurrent_analyses)
+            ]
+    
+    async def _analysis_worker(self) -> None:
+        """Run queued pull request analyses one at a time, forever."""
+        while True:
+            event, done = await self.processing_queue.get()
+            try:
+                await self._run_pull_request_analysis(event)
+            finally:
+                if not done.done():
+                    done.set_result(None)
+                self.processing_queue.task_done()
+    
+    async def _run_pull_request_analysis(self, event: WebhookEvent) -> bool:
+        """
+        Fetch a pull request's changed files and analyze them.
+        
+        Called by an analysis worker with the latest event for a pull request.
+        
+        Args:
+            event: The webhook event to process
+            
+        Returns:
+            True if processing was successful, False otherwise
+        """
         try:
             # Get PR information and changed files
-            pr_info = await self.github_client.get_pull_request_info(
-                event.repository_owner, 
-                event.repository_name, 
-                event.pr_number
-            )
+            pr_info, changed_files = await self._get_pull_request_data(event)
             
             if not pr_info:
-                logger.error(f"Could not fetch PR info for #{event.pr_number}")
+                logger.error("Could not fetch PR info for #%s", event.pr_number)
                 return False
             
-            # Get the files changed in this PR
-            changed_files = await self.github_client.fetch_pull_request_files(
-                event.repository_owner,
-                event.repository_name, 
-                event.pr_number
-            )
-            
             if not changed_files:
-                logger.warning(f"No files found in PR #{event.pr_number}")
+                logger.warning("No files found in PR #%s", event.pr_number)
                 # Post a comment saying no files to analyze
                 await self.github_client.post_review_comment(
                     event.repository_owner,
@@ -158,19 +354,64 @@ class WebhookProcessor:
                 )
                 return True
             
-            # Start background analysis
-            asyncio.create_task(
-                self._analyze_pull_request_files(
-                    event, pr_info, changed_files
-                )
-            )
-            
+            await self._analyze_pull_request_files(event, pr_info, changed_files)
             return True
             
         except Exception as e:
-            logger.error(f"Error processing PR event: {e}")
+            logger.error("Error processing PR event: %s", e)
             return False
     
+    async def _get_pull_request_data(
+        self,
+        event: WebhookEvent
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        Fetch a pull request's info and changed files, memoized per head commit.
+        
+        Both only change when new commits are pushed, so they are kept for
+        PR_DATA_CACHE_TTL seconds keyed by the head SHA from the event; a
+        synchronize event carries the new SHA and so misses naturally.
+        Events without a head SHA always fetch.
+        
+        Args:
+            event: Pull request webhook event
+            
+        Returns:
+            Tuple of (pull request info or None, list of changed files)
+        """
+        key = None
+        if event.pr_head_sha:
+            key = (event.repository_owner, event.repository_name, event.pr_number, event.pr_head_sha)
+            cached = self._pr_data_cache.get(key)
+            if cached and time.monotonic() - cached[0] < PR_DATA_CACHE_TTL:
+                self._pr_data_cache.move_to_end(key)
+                logger.debug("Using cached data for PR #%s at %s", event.pr_number, event.pr_head_sha)
+                return cached[1], cached[2]
+        
+        pr_info = await self.github_client.get_pull_request_info(
+            event.repository_owner, 
+            event.repository_name, 
+            event.pr_number
+        )
+        if not pr_info:
+            return None, []
+        
+        # Get the files changed in this PR
+        changed_files = await self.github_client.fetch_pull_request_files(
+            event.repository_owner,
+            event.repository_name, 
+            event.pr_number
+        )
+        
+        # Only complete answers are remembered
+        if key is not None and changed_files:
+            self._pr_data_cache[key] = (time.monotonic(), pr_info, changed_files)
+            self._pr_data_cache.move_to_end(key)
+            if len(self._pr_data_cache) > PR_DATA_CACHE_SIZE:
+                self._pr_data_cache.popitem(last=False)
+        
+        return pr_info, changed_files
+    
     async def process_push_event(self, event: WebhookEvent) -> bool:
         """
         Process push webhook events.
@@ -186,8 +427,8 @@ class WebhookProcessor:
             True if processing was successful, False otherwise
         """
         logger.info(
-            f"Processing push to {event.ref} in {event.repository_full_name} "
-            f"({len(event.commits or [])} commits)"
+            "Processing push to %s in %s (%d commits)",
+            event.ref, event.repository_full_name, len(event.commits or [])
         )
         
         # For now, just log the push event
@@ -214,88 +455,95 @@ class WebhookProcessor:
             changed_files: List of files changed in the PR
         """
         try:
-            logger.info(f"Starting background analysis for PR #{event.pr_number}")
+            logger.info("Starting background analysis for PR #%s", event.pr_number)
             
-            # Post initial comment to let users know analysis is starting
-            await self.github_client.post_review_comment(
+            # Let users know analysis is starting without waiting on GitHub
+            _spawn(self.github_client.post_review_comment(
                 event.repository_owner,
                 event.repository_name,
                 event.pr_number,
                 "🤖 AI-CodeReview: Analysis started. Results will be posted shortly..."
-            )
+            ))
             
-            analysis_results = []
-            total_issues = 0
+            # Files are independent, so fetches and analyses overlap across
+            # files, with at most analysis_concurrency in flight at once
+            semaphore = asyncio.Semaphore(self.settings.analysis_concurrency)
             
-            # Analyze each changed file
+            async def _process_one(file_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._analyze_pull_request_file(file_info)
+            
+            selected = []
             for file_info in changed_files:
-                file_path = file_info["filename"]
-                
                 # Skip files we don't want to analyze
-                if not self._should_analyze_file(file_path):
-                    logger.debug(f"Skipping file: {file_path}")
+                skip_reason = self._skip_reason(file_info)
+                if skip_reason:
+                    logger.debug("Skipping file %s: %s", file_info["filename"], skip_reason)
                     continue
-                
-                logger.info(f"Analyzing file: {file_path}")
-                
-                # Get file content from GitHub
-                file_content = await self.github_client.get_file_content(
-                    event.repository_owner,
-                    event.repository_name,
-                    file_path,
-                    pr_info.branch
-                )
-                
-                if not file_content:
-                    logger.warning(f"Could not fetch content for {file_path}")
-                    continue
-                
-                # Run AI analysis on the file
-                analysis_result = await self.code_analyzer.analyze_code(
-                    file_content, file_path
+                selected.append(file_info)
+            
+            max_files = self.settings.max_files_per_pr
+            if len(selected) > max_files:
+                logger.info(
+                    "PR #%s has %d analyzable files; analyzing the first %d",
+                    event.pr_number, len(selected), max_files
                 )
+                selected = selected[:max_files]
+            
+            outcomes = await asyncio.gather(
+                *(_process_one(file_info) for file_info in selected),
+                return_exceptions=True
+            )
+            
+            analysis_results = []
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error("Error analyzing file in PR #%s: %s", event.pr_number, outcome)
+                elif outcome is not None:
+                    analysis_results.append(outcome)
+            
+            total_issues = sum(result["issues_count"] for result in analysis_results)
+            
+            # Persist results in one round-trip, then post everything as a
+            # single review: the summary as its body and a comment on each
+            # file with significant findings
+            if analysis_results:
+                await self._save_analysis_results(event, pr_info, analysis_results)
                 
-                # Track results for summary
-                file_issues = len(analysis_result.security_issues)
-                total_issues += file_issues
-                
-                analysis_results.append({
-                    "file": file_path,
-                    "result": analysis_result,
-                    "issues_count": file_issues
-                })
+                review_body = [self._format_summary_comment(analysis_results, total_issues)]
+                review_comments = []
+                for result in analysis_results:
+                    analysis_result = result["result"]
+                    if result["issues_count"] == 0 and analysis_result.quality_score >= 70:
+                        continue
+                    
+                    comment = self._format_file_analysis_comment(analysis_result, result["file"])
+                    if result["line"] is None:
+                        # No diff line to anchor to; fold it into the body
+                        review_body.append(comment)
+                    else:
+                        review_comments.append({
+                            "path": result["file"],
+                            "line": result["line"],
+                            "side": "RIGHT",
+                            "body": comment
+                        })
                 
-                # Post detailed analysis if there are significant findings
-                if file_issues > 0 or analysis_result.quality_score < 70:
-                    comment = self._format_file_analysis_comment(
-                        analysis_result, file_path
-                    )
-                    await self.github_client.post_review_comment(
-                        event.repository_owner,
-                        event.repository_name,
-                        event.pr_number,
-                        comment
-                    )
-            
-            # Post summary comment with overall results
-            if analysis_results:
-                summary_comment = self._format_summary_comment(
-                    analysis_results, total_issues
-                )
-                await self.github_client.post_review_comment(
+                await self.github_client.submit_review(
                     event.repository_owner,
                     event.repository_name,
                     event.pr_number,
-                    summary_comment
+                    body="\n\n".join(review_body),
+                    comments=review_comments
                 )
             
             logger.info(
-                f"Completed analysis for PR #{event.pr_number}. "
-                f"Analyzed {len(analysis_results)} files, found {total_issues} issues."
+                "Completed analysis for PR #%s. Analyzed %d files, found %d issues.",
+                event.pr_number, len(analysis_results), total_issues
             )
             
         except Exception as e:
-            logger.error(f"Error in background analysis for PR #{event.pr_number}: {e}")
+            logger.error("Error in background analysis for PR #%s: %s", event.pr_number, e)
             
             # Post error comment to let users know something went wrong
             await self.github_client.post_review_comment(
@@ -306,6 +554,119 @@ class WebhookProcessor:
                 "Please try again or contact support if the issue persists."
             )
     
+    async def _analyze_pull_request_file(
+        self,
+        file_info: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Analyze the lines a single changed file adds.
+        
+        The result records the first diff line of the file so its review
+        comment can be anchored there.
+        
+        Args:
+            file_info: File entry from the pull request's file list; it
+                must carry a patch (see _skip_reason)
+            
+        Returns:
+            Result entry for the summary, or None if there was nothing to analyze
+        """
+        file_path = file_info["filename"]
+        logger.info("Analyzing file: %s", file_path)
+        
+        # Analyze the lines the diff adds
+        patch = file_info["patch"]
+        file_content = extract_added_lines(patch)
+        
+        if not file_content:
+            logger.warning("No content to analyze for %s", file_path)
+            return None
+        
+        # Run AI analysis on the file
+        analysis_result = await self.code_analyzer.analyze_code(
+            file_content, file_path
+        )
+        
+        return {
+            "file": file_path,
+            "result": analysis_result,
+            "issues_count": len(analysis_result.security_issues),
+            "line": first_changed_line(patch)
+        }
+    
+    async def _save_analysis_results(
+        self,
+        event: WebhookEvent,
+        pr_info: Any,
+        analysis_results: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store the analysis results for a pull request.
+        
+        Rows are buffered and written with a single executemany INSERT inside
+        one transaction rather than an INSERT per file. A storage failure is
+        logged but does not stop the results being posted to GitHub.
+        
+        Args:
+            event: The original webhook event
+            pr_info: Pull request information from GitHub
+            analysis_results: Per-file results collected during analysis
+        """
+        records = [
+            {
+                "analysis_id": uuid4().hex,
+                "file_path": result["file"],
+                "analysis_result": asdict(result["result"]),
+                "branch": pr_info.branch,
+            }
+            for result in analysis_results
+        ]
+        
+        try:
+            session_factory = get_session_factory()
+            async with session_factory() as session:
+                async with session.begin():
+                    saved = await bulk_create_analysis_records(session, records)
+            
+            logger.info("Saved %s analysis records for PR #%s", saved, event.pr_number)
+            
+        except Exception as e:
+            logger.error("Error saving analysis records for PR #%s: %s", event.pr_number, e)
+    
+    def _skip_reason(self, file_info: Dict[str, Any]) -> Optional[str]:
+        """
+        Decide from the pull request file entry alone whether to skip a file.
+        
+        The files listing already carries each file's status, change count
+        and patch, so deletions, pure renames, binary files and oversized
+        diffs are dropped before any download or model call.
+        
+        Args:
+            file_info: File entry from the pull request's file list
+            
+        Returns:
+            Why the file is skipped, or None if it should be analyzed
+        """
+        if not self._should_analyze_file(file_info["filename"]):
+            return "unsupported file type"
+        
+        file_status = file_info.get("status")
+        if file_status == "removed":
+            return "file removed"
+        if file_status == "renamed" and not file_info.get("changes"):
+            return "renamed without changes"
+        
+        # GitHub omits the patch for binary files and very large diffs
+        patch = file_info.get("patch")
+        if not patch:
+            return "no patch (binary or too large)"
+        if file_info.get("changes", 0) > self.settings.max_file_changes:
+            return "too many changed lines"
+        if len(patch) > self.settings.max_file_size:
+            return "patch too large"
+        
+        return None
+    
     def _should_analyze_file(self, file_path: str) -> bool:
         """
         Determine if a file should be analyzed based on its extension.
@@ -322,16 +683,10 @@ class WebhookProcessor:
         if not file_path:
             return False
         
-        # Get file extension
-        extension = file_path.split('.')[-1].lower() if '.' in file_path else ''
-        
-        # Supported file extensions for analysis
-        analyzable_extensions = {
-            'py', 'js', 'ts', 'java', 'cpp', 'cc', 'cxx', 'c', 'h', 
-            'go', 'rs', 'php', 'rb', 'swift', 'kt', 'scala', 'cs'
-        }
+        # Get file extension without splitting the whole path
+        _, dot, extension = file_path.rpartition('.')
         
-        return extension in analyzable_extensions
+        return bool(dot) and extension.lower() in _ANALYZABLE_EXTS
     
     def _format_file_analysis_comment(self, analysis_result: Any, file_path: str) -> str:
         """
@@ -347,32 +702,35 @@ class WebhookProcessor:
         Returns:
             Formatted comment text
         """
-        comment = f"## 🤖 AI-CodeReview Analysis: `{file_path}`\n\n"
-        comment += f"**Overall Rating:** {analysis_result.overall_rating}\n"
-        comment += f"**Quality Score:** {analysis_result.quality_score:.1f}/100\n\n"
+        parts = [
+            f"## 🤖 AI-CodeReview Analysis: `{file_path}`\n\n"
+            f"**Overall Rating:** {analysis_result.overall_rating}\n"
+            f"**Quality Score:** {analysis_result.quality_score:.1f}/100\n\n"
+        ]
         
         # Security issues section
         if analysis_result.security_issues:
-            comment += "### 🔒 Security Issues Found:\n"
+            parts.append("### 🔒 Security Issues Found:\n")
             for issue in analysis_result.security_issues:
-                severity_emoji = "🔴" if issue['severity'] == 'HIGH' else "🟡"
-                comment += f"{severity_emoji} **{issue['severity']}**: {issue['description']}\n"
-            comment += "\n"
+                severity = issue['severity']
+                parts.append(
+                    f"{_SEVERITY_EMOJI.get(severity, '🟡')} **{severity}**: {issue['description']}\n"
+                )
+            parts.append("\n")
         
         # Improvement suggestions
         if analysis_result.suggestions:
-            comment += "### 💡 Suggestions for Improvement:\n"
+            parts.append("### 💡 Suggestions for Improvement:\n")
             for suggestion in analysis_result.suggestions[:3]:  # Limit to top 3
-                comment += f"- {suggestion}\n"
-            comment += "\n"
+                parts.append(f"- {suggestion}\n")
+            parts.append("\n")
         
         # AI documentation
         if analysis_result.documentation:
-            comment += f"### 📖 What this code does:\n"
-            comment += f"``````\n\n"
+            parts.append("### 📖 What this code does:\n``````\n\n")
         
-        comment += "*Generated by AI-CodeReview*"
-        return comment
+        parts.append("*Generated by AI-CodeReview*")
+        return "".join(parts)
     
     def _format_summary_comment(self, analysis_results: List[Dict], total_issues: int) -> str:
         """
@@ -388,34 +746,32 @@ class WebhookProcessor:
         Returns:
             Formatted summary comment
         """
-        comment = "## 🤖 AI-CodeReview Summary\n\n"
-        comment += f"**Files Analyzed:** {len(analysis_results)}\n"
-        comment += f"**Total Issues Found:** {total_issues}\n\n"
+        parts = [
+            "## 🤖 AI-CodeReview Summary\n\n"
+            f"**Files Analyzed:** {len(analysis_results)}\n"
+            f"**Total Issues Found:** {total_issues}\n\n"
+        ]
         
         if analysis_results:
-            comment += "### 📊 File Results:\n"
-            for result in analysis_results:
-                status_emoji = "✅" if result["issues_count"] == 0 else "⚠️"
-                quality_score = result["result"].quality_score
-                rating = result["result"].overall_rating
-                
-                comment += (
-                    f"{status_emoji} `{result['file']}` - "
-                    f"Quality: {quality_score:.1f}/100, "
-                    f"Issues: {result['issues_count']}, "
-                    f"Rating: {rating}\n"
-                )
+            parts.append("### 📊 File Results:\n")
+            parts.extend(
+                f"{'✅' if result['issues_count'] == 0 else '⚠️'} `{result['file']}` - "
+                f"Quality: {result['result'].quality_score:.1f}/100, "
+                f"Issues: {result['issues_count']}, "
+                f"Rating: {result['result'].overall_rating}\n"
+                for result in analysis_results
+            )
         
         # Overall recommendation
         if total_issues == 0:
-            comment += "\n🎉 **Great job!** No security issues found. Code looks good to merge!"
+            parts.append("\n🎉 **Great job!** No security issues found. Code looks good to merge!")
         elif total_issues <= 3:
-            comment += "\n✨ **Good work!** Only minor issues found. Consider addressing them before merging."
+            parts.append("\n✨ **Good work!** Only minor issues found. Consider addressing them before merging.")
         else:
-            comment += "\n⚠️ **Attention needed.** Several issues found. Please review and address them."
+            parts.append("\n⚠️ **Attention needed.** Several issues found. Please review and address them.")
         
-        comment += "\n\n*Powered by AI-CodeReview - Automated Code Analysis*"
-        return comment
+        parts.append("\n\n*Powered by AI-CodeReview - Automated Code Analysis*")
+        return "".join(parts)
 
 class WebhookHandler:
     """
@@ -436,65 +792,122 @@ class WebhookHandler:
         self.settings = settings
         self.processor = WebhookProcessor(settings)
         
+        # Encoded once; None disables signature checks
+        self._webhook_secret: Optional[bytes] = (
+            settings.github_webhook_secret.get_secret_value().encode("utf-8")
+            if settings.github_webhook_secret else None
+        )
+        
         logger.info("Webhook handler initialized")
     
     async def handle_webhook(
         self, 
         event_type: str, 
-        payload: Dict[str, Any]
+        payload: Union[bytes, str, Dict[str, Any]],
+        signature: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Handle an incoming webhook event.
         
         This is the main entry point for processing GitHub webhooks.
-        It parses the payload, creates an event object, and dispatches
-        it to the appropriate processor.
+        It parses the payload into an event object and hands it to the
+        appropriate processor on a background task, returning as soon as
+        the event is queued so GitHub's delivery never waits on our API
+        calls or analysis.
         
         Args:
             event_type: The GitHub event type (from X-GitHub-Event header)
-            payload: The webhook payload from GitHub
+            payload: The webhook payload from GitHub, either the raw request
+                body (parsed here with orjson) or an already-decoded dict.
+                When a webhook secret is configured it must be the raw body.
+            signature: X-Hub-Signature-256 header, checked against the raw
+                body before it is parsed when a webhook secret is configured
             
         Returns:
             Response dictionary with status and message
+            
+        Raises:
+            HTTPException: 401 if a webhook secret is configured and the
+                delivery is not a raw body with a valid signature; 503 if
+                a pull request event arrives while the analysis queue is full
         """
+        # Every delivery is authenticated on the raw bytes before anything
+        # else; a decoded dict cannot be verified, so it is refused too
+        if self._webhook_secret is not None:
+            if not isinstance(payload, (bytes, str)) or not self._verify_signature(payload, signature):
+                logger.warning("Rejected %s webhook with invalid signature", event_type)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid webhook signature"
+                )
+        
+        # Unsupported events are dropped before the payload is parsed
+        if event_type not in _SUPPORTED_EVENTS:
+            logger.info("Ignoring unsupported event type: %s", event_type)
+            return {
+                "status": "ignored",
+                "message": f"Event type '{event_type}' not supported"
+            }
+        
+        # Refuse new pull request work while the analysis backlog is full,
+        # before anything is accepted, so GitHub can redeliver it later
+        if event_type == "pull_request" and not self.processor.is_accepting():
+            logger.warning("Analysis queue full, refusing %s webhook", event_type)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Analysis queue is full, try again later"
+            )
+        
         try:
+            # Decode the body only once we know the event is wanted
+            if isinstance(payload, (bytes, str)):
+                payload = orjson.loads(payload)
+            
             # Parse the webhook event
             event = self._parse_webhook_event(event_type, payload)
             
-            if event.event_type == WebhookEventType.UNKNOWN:
-                logger.info(f"Ignoring unsupported event type: {event_type}")
-                return {
-                    "status": "ignored",
-                    "message": f"Event type '{event_type}' not supported"
-                }
-            
             # Log the incoming event
             logger.info(
-                f"Processing {event.event_type.value} event from "
-                f"{event.repository_full_name} by {event.sender}"
+                "Processing %s event from %s by %s",
+                event.event_type.value, event.repository_full_name, event.sender
             )
             
-            # Dispatch to appropriate processor
-            success = await self._dispatch_event(event)
-            
-            if success:
-                return {
-                    "status": "success",
-                    "message": f"Event processed successfully"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": "Event processing failed"
-                }
+            # Dispatch to appropriate processor without waiting for it
+            _spawn(self._dispatch_in_background(event))
+            
+            return {
+                "status": "accepted",
+                "message": "queued"
+            }
                 
         except Exception as e:
-            logger.error(f"Error handling webhook: {e}")
+            logger.error("Error handling webhook: %s", e)
             return {
                 "status": "error",
                 "message": f"Webhook processing failed: {str(e)}"
             }
     
+    def _verify_signature(self, body: Union[bytes, str], signature: Optional[str]) -> bool:
+        """
+        Check a raw webhook body against GitHub's HMAC-SHA256 signature.
+        
+        Args:
+            body: Raw request body
+            signature: X-Hub-Signature-256 header ("sha256=<hex>")
+            
+        Returns:
+            True if the signature matches the configured secret
+        """
+        if not signature or not signature.startswith("sha256="):
+            return False
+        
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        
+        # Compared as bytes: compare_digest rejects non-ASCII str input
+        expected = hmac.digest(self._webhook_secret, body, "sha256").hex().encode("ascii")
+        return hmac.compare_digest(expected, signature[7:].encode("utf-8"))
+    
     def _parse_webhook_event(self, event_type: str, payload: Dict[str, Any]) -> WebhookEvent:
         """
         Parse a raw webhook payload into a structured event object.
@@ -510,23 +923,17 @@ class WebhookHandler:
             Parsed webhook event object
         """
         # Map GitHub event types to the enum
-        event_type_mapping = {
-            "pull_request": WebhookEventType.PULL_REQUEST,
-            "push": WebhookEventType.PUSH,
-            "pull_request_review": WebhookEventType.PULL_REQUEST_REVIEW,
-            "check_run": WebhookEventType.CHECK_RUN,
-        }
+        parsed_event_type = _EVENT_TYPE_MAP.get(event_type, WebhookEventType.UNKNOWN)
         
-        parsed_event_type = event_type_mapping.get(event_type, WebhookEventType.UNKNOWN)
-        
-        # Extract repository information
-        repository = payload.get("repository", {})
-        repository_owner = repository.get("owner", {}).get("login", "")
+        # Extract repository information; each nested object is looked up
+        # once, and "or {}" also covers fields GitHub sends as null
+        repository = payload.get("repository") or {}
+        repository_owner = (repository.get("owner") or {}).get("login", "")
         repository_name = repository.get("name", "")
         repository_full_name = repository.get("full_name", "")
         
         # Extract sender information
-        sender = payload.get("sender", {}).get("login", "")
+        sender = (payload.get("sender") or {}).get("login", "")
         
         # Create base event object
         event = WebhookEvent(
@@ -535,19 +942,22 @@ class WebhookHandler:
             repository_name=repository_name,
             repository_full_name=repository_full_name,
             sender=sender,
-            timestamp=datetime.utcnow(),
-            raw_payload=payload
+            timestamp=datetime.now(timezone.utc)
         )
+        if self.settings.retain_raw_payload:
+            event.raw_payload = zlib.compress(orjson.dumps(payload), 1)
         
         # Extract event-specific information
         if parsed_event_type == WebhookEventType.PULL_REQUEST:
-            pr = payload.get("pull_request", {})
+            pr = payload.get("pull_request") or {}
+            head = pr.get("head") or {}
             event.pr_number = pr.get("number")
             event.pr_action = payload.get("action")
             event.pr_title = pr.get("title")
-            event.pr_author = pr.get("user", {}).get("login")
-            event.pr_branch = pr.get("head", {}).get("ref")
-            event.pr_base_branch = pr.get("base", {}).get("ref")
+            event.pr_author = (pr.get("user") or {}).get("login")
+            event.pr_branch = head.get("ref")
+            event.pr_base_branch = (pr.get("base") or {}).get("ref")
+            event.pr_head_sha = head.get("sha")
             
         elif parsed_event_type == WebhookEventType.PUSH:
             event.ref = payload.get("ref")
@@ -557,6 +967,25 @@ class WebhookHandler:
         
         return event
     
+    async def _dispatch_in_background(self, event: WebhookEvent) -> None:
+        """
+        Dispatch an event from a background task, logging any failure.
+        
+        Nobody awaits this task, so errors are reported here rather than
+        in the webhook response.
+        
+        Args:
+            event: The webhook event to process
+        """
+        try:
+            if not await self._dispatch_event(event):
+                logger.error(
+                    "Processing failed for %s event from %s",
+                    event.event_type.value, event.repository_full_name
+                )
+        except Exception as e:
+            logger.error("Error dispatching %s event: %s", event.event_type.value, e)
+    
     async def _dispatch_event(self, event: WebhookEvent) -> bool:
         """
         Dispatch an event to the appropriate processor.
@@ -577,5 +1006,5 @@ class WebhookHandler:
             return await self.processor.process_push_event(event)
         
         else:
-            logger.info(f"No processor for event type: {event.event_type}")
+            logger.info("No processor for event type: %s", event.event_type)
             return True  # Not an error, just not implemented yet
\ No newline at end of file
@@ -10,6 +10,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, AsyncMock, patch
 import json
+from dataclasses import replace
 from typing import Dict, Any
 
 from ..main import app
@@ -183,6 +184,77 @@ class TestCodeAnalysisEndpoints(TestAPIClient):
                 response = client.post("/api/v1/analyze", json=request_data)
                 assert response.status_code == 200
 
+    @patch('app.services.code_analyzer.CodeAnalyzer.analyze_code')
+    def test_bulk_analyze_endpoint(self, mock_analyze, client, sample_analysis_request, mock_analysis_result):
+        """Test bulk analysis returns one result per file plus a summary."""
+        mock_analyze.return_value = mock_analysis_result
+        
+        response = client.post(
+            "/api/v1/analyze/bulk",
+            json={"files": [sample_analysis_request] * 3}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["total_files"] == 3
+        assert len(data["results"]) == 3
+        assert data["summary"]["average_quality_score"] == 85.5
+        assert mock_analyze.call_count == 3
+    
+    @patch('app.services.code_analyzer.CodeAnalyzer.analyze_code')
+    def test_bulk_analyze_excludes_skipped_files(self, mock_analyze, client, sample_analysis_request, mock_analysis_result):
+        """Test that skipped non-code files stay out of the bulk averages."""
+        skipped_result = replace(mock_analysis_result, quality_score=100.0, skipped=True)
+        mock_analyze.side_effect = [mock_analysis_result, skipped_result]
+        readme_request = {"code_content": "# Project", "file_path": "README.md"}
+        
+        response = client.post(
+            "/api/v1/analyze/bulk",
+            json={"files": [sample_analysis_request, readme_request]}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [result["status"] for result in data["results"]] == ["success", "skipped"]
+        assert data["summary"]["average_quality_score"] == 85.5
+        assert data["summary"]["files_skipped"] == 1
+        assert data["summary"]["files_failed"] == 0
+
+class TestAnalysisJobEndpoints(TestAPIClient):
+    """Test background analysis job endpoints."""
+    
+    @patch('app.api.routes._run_analysis_job', new_callable=AsyncMock)
+    @patch('app.api.routes._store_analysis_job', new_callable=AsyncMock)
+    def test_submit_analysis_job(self, mock_store, mock_run, client, sample_analysis_request):
+        """Test that submitting a job returns a job ID without waiting for analysis."""
+        response = client.post("/api/v1/analyze/jobs", json=sample_analysis_request)
+        
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "queued"
+        assert data["job_id"]
+        mock_store.assert_awaited_once()
+        mock_run.assert_awaited_once()
+    
+    @patch('app.api.routes._load_analysis_job', new_callable=AsyncMock)
+    def test_get_analysis_job_status(self, mock_load, client):
+        """Test fetching the state of an existing job."""
+        mock_load.return_value = {"job_id": "abc123", "status": "running"}
+        
+        response = client.get("/api/v1/analyze/jobs/abc123")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "running"
+    
+    @patch('app.api.routes._load_analysis_job', new_callable=AsyncMock)
+    def test_unknown_analysis_job(self, mock_load, client):
+        """Test that unknown or expired jobs return 404."""
+        mock_load.return_value = None
+        
+        assert client.get("/api/v1/analyze/jobs/missing").status_code == 404
+        assert client.get("/api/v1/analyze/jobs/missing/stream").status_code == 404
+
 class TestWebhookEndpoints(TestAPIClient):
     """Test GitHub webhook processing endpoints."""
     
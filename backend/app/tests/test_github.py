@@ -12,7 +12,7 @@ from unittest.mock import Mock, AsyncMock, patch
 from typing import Dict, Any
 import base64
 
-from ..services.github_integration import GitHubIntegration, PullRequestInfo
+from ..services.github_integration import GitHubIntegration, PullRequestInfo, extract_added_lines, first_changed_line
 from ..models.repository import GitHubUser, Repository
 
 class TestGitHubIntegration:
@@ -132,7 +132,7 @@ class TestPullRequestOperations(TestGitHubIntegration):
         mock_session_response.json.return_value = files_data
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_session_response
             
             result = await github_client.fetch_pull_request_files("testuser", "test-repo", 1)
             
@@ -140,6 +140,20 @@ class TestPullRequestOperations(TestGitHubIntegration):
             assert result[0]["filename"] == "src/main.py"
             assert result[1]["filename"] == "tests/test_main.py"
     
+    def test_extract_added_lines_from_patch(self):
+        """Test that only added diff lines are kept for analysis."""
+        patch_text = (
+            "--- a/src/main.py\n"
+            "+++ b/src/main.py\n"
+            "@@ -1,2 +1,3 @@\n"
+            " import os\n"
+            "-x = 1\n"
+            "+x = 2\n"
+            "+y = x + 1"
+        )
+        
+        assert extract_added_lines(patch_text) == "x = 2\ny = x + 1"
+    
     @pytest.mark.asyncio
     async def test_fetch_pull_request_files_api_error(self, github_client):
         """Test handling of API errors when fetching PR files"""
@@ -147,7 +161,7 @@ class TestPullRequestOperations(TestGitHubIntegration):
         mock_response.status = 404
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.fetch_pull_request_files("testuser", "nonexistent-repo", 1)
             
@@ -159,7 +173,7 @@ class TestPullRequestOperations(TestGitHubIntegration):
         mock_session_response.json.return_value = sample_pull_request_data
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_session_response
             
             result = await github_client.get_pull_request_info("testuser", "test-repo", 1)
             
@@ -177,7 +191,7 @@ class TestPullRequestOperations(TestGitHubIntegration):
         mock_response.status = 404
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.get_pull_request_info("testuser", "test-repo", 999)
             
@@ -189,7 +203,21 @@ class TestFileContentOperations(TestGitHubIntegration):
     @pytest.mark.asyncio
     async def test_get_file_content_success(self, github_client, mock_session_response):
         """Test successful file content retrieval"""
-        # Mock file content (base64 encoded)
+        # Raw media type returns the file body directly
+        file_content = "def hello():\n    print('Hello, World!')"
+        mock_session_response.text = AsyncMock(return_value=file_content)
+        
+        with patch('aiohttp.ClientSession') as mock_session:
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            
+            result = await github_client.get_file_content("testuser", "test-repo", "src/main.py")
+            
+            assert result == file_content
+            assert mock_session.return_value.get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_file_content_falls_back_to_base64(self, github_client, mock_session_response):
+        """Test base64 JSON content is used when the raw request fails."""
         file_content = "def hello():\n    print('Hello, World!')"
         encoded_content = base64.b64encode(file_content.encode('utf-8')).decode('utf-8')
         
@@ -198,9 +226,11 @@ class TestFileContentOperations(TestGitHubIntegration):
             "encoding": "base64"
         }
         mock_session_response.json.return_value = file_data
+        raw_failure = Mock()
+        raw_failure.status = 415
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            mock_session.return_value.get.return_value.__aenter__.side_effect = [raw_failure, mock_session_response]
             
             result = await github_client.get_file_content("testuser", "test-repo", "src/main.py")
             
@@ -213,7 +243,7 @@ class TestFileContentOperations(TestGitHubIntegration):
         mock_response.status = 404
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.get_file_content("testuser", "test-repo", "nonexistent.py")
             
@@ -227,13 +257,28 @@ class TestFileContentOperations(TestGitHubIntegration):
             "encoding": "unknown"
         }
         mock_session_response.json.return_value = file_data
+        raw_failure = Mock()
+        raw_failure.status = 415
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            mock_session.return_value.get.return_value.__aenter__.side_effect = [raw_failure, mock_session_response]
             
             result = await github_client.get_file_content("testuser", "test-repo", "file.txt")
             
             assert result is None
+    
+    @pytest.mark.asyncio
+    async def test_get_files_content_maps_each_path(self, github_client):
+        """Test fetching several files returns content keyed by path."""
+        contents = {"src/a.py": "a = 1", "src/b.py": None}
+        
+        async def fake_get_file_content(owner, name, file_path, ref="main"):
+            return contents[file_path]
+        
+        with patch.object(github_client, "get_file_content", side_effect=fake_get_file_content):
+            result = await github_client.get_files_content("testuser", "test-repo", list(contents))
+        
+        assert result == contents
 
 class TestCommentOperations(TestGitHubIntegration):
     """Test comment posting operations."""
@@ -245,7 +290,7 @@ class TestCommentOperations(TestGitHubIntegration):
         mock_response.status = 201
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.post.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.post_review_comment(
                 "testuser", "test-repo", 1, "Great work on this PR!"
@@ -260,7 +305,7 @@ class TestCommentOperations(TestGitHubIntegration):
         mock_response.status = 201
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.post.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.post_review_comment(
                 "testuser", "test-repo", 1, 
@@ -278,7 +323,7 @@ class TestCommentOperations(TestGitHubIntegration):
         mock_response.status = 403  # Forbidden
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.post.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.post_review_comment(
                 "testuser", "test-repo", 1, "Comment"
@@ -286,6 +331,35 @@ class TestCommentOperations(TestGitHubIntegration):
             
             assert result is False
 
+    @pytest.mark.asyncio
+    async def test_submit_review_sends_all_comments(self, github_client):
+        """Test that one review POST carries every file comment."""
+        mock_response = Mock()
+        mock_response.status = 200
+        comments = [
+            {"path": "src/a.py", "line": 3, "body": "First"},
+            {"path": "src/b.py", "line": 10, "body": "Second"}
+        ]
+        
+        with patch('aiohttp.ClientSession') as mock_session:
+            mock_post = mock_session.return_value.post
+            mock_post.return_value.__aenter__.return_value = mock_response
+            
+            result = await github_client.submit_review(
+                "testuser", "test-repo", 1, "Summary", comments=comments
+            )
+            
+            assert result is True
+            assert mock_post.call_count == 1
+            assert mock_post.call_args[0][0].endswith("/pulls/1/reviews")
+            assert mock_post.call_args[1]["json"]["comments"] == comments
+    
+    def test_first_changed_line_from_patch(self):
+        """Test finding the first commentable line of a patch."""
+        assert first_changed_line("@@ -1,2 +5,3 @@\n a\n+b") == 5
+        assert first_changed_line("@@ -1 +1 @@\n-a\n+b") == 1
+        assert first_changed_line("@@ -1,2 +0,0 @@\n-a\n-b") is None
+
 class TestRepositoryOperations(TestGitHubIntegration):
     """Test repository information retrieval."""
     
@@ -295,7 +369,7 @@ class TestRepositoryOperations(TestGitHubIntegration):
         mock_session_response.json.return_value = sample_repository_data
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_session_response
             
             result = await github_client.get_repository_info("testuser", "test-repo")
             
@@ -304,19 +378,56 @@ class TestRepositoryOperations(TestGitHubIntegration):
             assert result["name"] == "test-repo"
             assert result["full_name"] == "testuser/test-repo"
     
+    @pytest.mark.asyncio
+    async def test_get_repository_info_not_modified_uses_cache(self, github_client, sample_repository_data, mock_session_response):
+        """Test that a 304 response is answered from the ETag cache."""
+        mock_session_response.json.return_value = sample_repository_data
+        mock_session_response.headers = {"ETag": '"abc123"'}
+        mock_session_response.links = {}
+        not_modified = Mock()
+        not_modified.status = 304
+        
+        with patch('aiohttp.ClientSession') as mock_session:
+            get = mock_session.return_value.get
+            get.return_value.__aenter__.side_effect = [mock_session_response, not_modified]
+            
+            first = await github_client.get_repository_info("testuser", "test-repo")
+            second = await github_client.get_repository_info("testuser", "test-repo")
+            
+            assert second == first
+            assert get.call_args.kwargs["headers"] == {"If-None-Match": '"abc123"'}
+    
     @pytest.mark.asyncio
     async def test_list_pull_requests_success(self, github_client, sample_pull_request_data, mock_session_response):
         """Test successful listing of pull requests."""
         mock_session_response.json.return_value = [sample_pull_request_data]
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_session_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_session_response
             
             result = await github_client.list_pull_requests("testuser", "test-repo")
             
             assert len(result) == 1
             assert result[0]["number"] == 1
             assert result[0]["title"] == "Add new feature"
+    
+    @pytest.mark.asyncio
+    async def test_iter_pull_requests_follows_next_link(self, github_client):
+        """Test that full pages are followed through the Link header."""
+        next_url = "https://api.github.com/repositories/1/pulls?page=2"
+        first_page = Mock(status=200, headers={}, links={"next": {"url": next_url}})
+        first_page.json = AsyncMock(return_value=[{"number": n} for n in range(100)])
+        last_page = Mock(status=200, headers={}, links={})
+        last_page.json = AsyncMock(return_value=[{"number": 100}])
+        
+        with patch('aiohttp.ClientSession') as mock_session:
+            get = mock_session.return_value.get
+            get.return_value.__aenter__.side_effect = [first_page, last_page]
+            
+            numbers = [pr["number"] async for pr in github_client.iter_pull_requests("testuser", "test-repo")]
+            
+            assert numbers == list(range(101))
+            assert get.call_args.args[0] == next_url
 
 class TestWebhookValidation(TestGitHubIntegration):
     """Test webhook signature validation."""
@@ -375,7 +486,7 @@ class TestCheckRunOperations(TestGitHubIntegration):
         mock_response.status = 201
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.post.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.create_check_run(
                 "testuser", "test-repo", "abc123def456",
@@ -391,7 +502,7 @@ class TestCheckRunOperations(TestGitHubIntegration):
         mock_response.status = 201
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.post.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.create_check_run(
                 "testuser", "test-repo", "abc123def456",
@@ -407,7 +518,7 @@ class TestErrorHandling(TestGitHubIntegration):
     async def test_network_error_handling(self, github_client):
         """Test handling of network errors."""
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.side_effect = aiohttp.ClientError("Network error")
+            mock_session.return_value.get.side_effect = aiohttp.ClientError("Network error")
             
             result = await github_client.get_repository_info("testuser", "test-repo")
             
@@ -417,7 +528,7 @@ class TestErrorHandling(TestGitHubIntegration):
     async def test_timeout_handling(self, github_client):
         """Test handling of request timeouts."""
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.side_effect = asyncio.TimeoutError()
+            mock_session.return_value.get.side_effect = asyncio.TimeoutError()
             
             result = await github_client.fetch_pull_request_files("testuser", "test-repo", 1)
             
@@ -431,8 +542,34 @@ class TestErrorHandling(TestGitHubIntegration):
         mock_response.json.side_effect = ValueError("Invalid JSON")
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
+            mock_session.return_value.get.return_value.__aenter__.return_value = mock_response
             
             result = await github_client.get_repository_info("testuser", "test-repo")
             
-            assert result is None
\ No newline at end of file
+            assert result is None
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self, github_client, sample_repository_data, mock_session_response):
+        """Test that a 429 is retried after its Retry-After delay."""
+        limited = Mock(status=429, headers={"Retry-After": "2"})
+        mock_session_response.json.return_value = sample_repository_data
+        mock_session_response.headers = {}
+        
+        with patch('aiohttp.ClientSession') as mock_session, \
+             patch('app.services.github_integration.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            get = mock_session.return_value.get
+            get.return_value.__aenter__.side_effect = [limited, mock_session_response]
+            
+            result = await github_client.get_repository_info("testuser", "test-repo")
+            
+            assert result == sample_repository_data
+            assert get.call_count == 2
+            mock_sleep.assert_awaited_once_with(2.0)
+    
+    def test_secret_token_is_unwrapped(self):
+        """Test that a SecretStr token is sent as its real value."""
+        secret = Mock(get_secret_value=Mock(return_value="ghp_real"))
+        
+        client = GitHubIntegration(secret)
+        
+        assert client.headers["Authorization"] == "token ghp_real"
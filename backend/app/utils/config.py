@@ -58,12 +58,21 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=10, ge=1, description="Database connection pool size")
     database_max_overflow: int = Field(default=20, ge=0, description="Database pool overflow")
     database_echo: bool = Field(default=False, description="Echo SQL queries")
+    database_pool_pre_ping: bool = Field(default=False, description="Ping pooled connections on checkout (ignored behind PgBouncer)")
+    use_pgbouncer: bool = Field(default=False, description="Database is reached through PgBouncer in transaction pooling mode")
+    
+    # Redis settings
+    redis_url: str = Field(default="redis://localhost:6379/0", description="Redis URL for caching and rate limiting")
     
     # AI model settings
     model_cache_dir: str = Field(default="./cache", description="AI model cache directory")
     model_download_timeout: int = Field(default=300, ge=30, description="Model download timeout")
     max_analysis_time: int = Field(default=300, ge=30, description="Max analysis time per file")
     max_concurrent_analyses: int = Field(default=5, ge=1, description="Max concurrent analyses")
+    webhook_coalesce_window_ms: int = Field(default=250, ge=100, le=500, description="Window for coalescing repeated PR events (ms)")
+    pr_analysis_min_interval: float = Field(default=10.0, ge=0.0, description="Minimum seconds between analyses of the same PR")
+    analysis_concurrency: int = Field(default=8, ge=1, description="Files analyzed concurrently within one PR")
+    retain_raw_payload: bool = Field(default=False, description="Keep a compressed copy of each webhook payload")
     
     # Security settings
     cors_origins: List[str] = Field(default=["*"], description="CORS allowed origins")
@@ -89,6 +98,7 @@ class Settings(BaseSettings):
     )
     max_file_size: int = Field(default=1024*1024, ge=1024, description="Max file size for analysis (bytes)")
     max_files_per_pr: int = Field(default=50, ge=1, description="Max files per PR analysis")
+    max_file_changes: int = Field(default=2000, ge=1, description="Max changed lines per file for analysis")
     quality_threshold: float = Field(default=70.0, ge=0.0, le=100.0, description="Quality score threshold")
     
     # Feature flags
@@ -113,8 +123,9 @@ class Settings(BaseSettings):
     
     @validator('database_url')
     def validate_database_url(cls, v):
-        """Validate database URL format."""
-        if not v.startswith(('sqlite://', 'postgresql://', 'mysql://')):
+        """Validate database URL format (an explicit driver such as +asyncpg is allowed)."""
+        backend = v.split('://', 1)[0].split('+', 1)[0]
+        if '://' not in v or backend not in ('sqlite', 'postgresql', 'mysql'):
             raise ValueError('Unsupported database URL format')
         return v
     
@@ -195,7 +206,7 @@ class Settings(BaseSettings):
         env_prefix = ""
 
 # Global settings instance with caching
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get application settings with caching.